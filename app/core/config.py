@@ -30,11 +30,12 @@ class Settings(BaseSettings):
     
     # MCP (Model Context Protocol) Configuration
     MCP_SERVER_ENABLED: bool = True
-    MCP_SERVER_TRANSPORT: str = "stdio"  # "stdio" for subprocess, "http" for external access
+    MCP_SERVER_TRANSPORT: str = "http"  # "http" for a local keep-alive server, "stdio" for subprocess
     MCP_SERVER_COMMAND: str = "python"
     MCP_SERVER_ARGS: List[str] = ["-m", "mcp_server.server"]
-    MCP_SERVER_URL: str = "http://0.0.0.0:8001/mcp"  # URL for HTTP transport
+    MCP_SERVER_URL: str = "http://127.0.0.1:8001/mcp"  # URL for HTTP transport
     MCP_SERVER_PORT: int = 8001  # Port for HTTP transport
+    MCP_SERVER_AUTOSTART: bool = True  # Launch the local HTTP MCP server with the API (once per host) when MCP tools are in use
     MCP_EXTERNAL_SERVERS: List[Dict[str, Any]] = []  # List of dicts with server configs: [{"name": "server1", "transport": "stdio", "command": "python", "args": [...]}]
     USE_NATIVE_TOOLS: bool = True  # Set to False to use MCP tools only, True for native LangGraph tools
     
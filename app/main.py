@@ -1,10 +1,13 @@
 """FastAPI application entry point."""
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
 from app.core.config import settings
 from app.api.v1.router import api_router
 from app.core.database import Base, engine
+from mcp_server.sidecar import start_mcp_sidecar, stop_mcp_sidecar
 
 # Ensure OPENAI_API_KEY is available as environment variable
 # Many libraries (OpenAI, LangChain) check os.environ directly
@@ -16,15 +19,45 @@
 if not os.environ.get("USER_AGENT") and settings.USER_AGENT:
     os.environ["USER_AGENT"] = settings.USER_AGENT
 
+# Arbitrary key for the advisory lock that serializes table creation
+_CREATE_TABLES_LOCK_KEY = 724193
+
+
+def _create_tables():
+    """Create missing tables, one process at a time on PostgreSQL.
+    
+    Several processes importing the app at once (pytest-xdist workers, multiple
+    uvicorn workers) would otherwise race on CREATE TABLE against the same
+    database. The transaction-level lock is released when the DDL commits.
+    """
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"),
+                {"key": _CREATE_TABLES_LOCK_KEY}
+            )
+        Base.metadata.create_all(bind=conn)
+
+
 # Create database tables
-Base.metadata.create_all(bind=engine)
+_create_tables()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop the local HTTP MCP server alongside the API."""
+    await start_mcp_sidecar()
+    yield
+    await stop_mcp_sidecar()
+
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -0,0 +1,166 @@
+"""Shared HRMS HTTP helpers.
+
+Every HRMS tool talks to the same API with the same admin credentials, so the
+connection pool, credential encryption and bearer token live here instead of
+being copied into each tool module.
+
+Usage:
+    from app.workflows.tools._hrms_http import HRMS_BASE_URL, hrms_client, get_token
+
+    token = get_token()
+    response = hrms_client().get(
+        f"{HRMS_BASE_URL}/api/...",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+import urllib3
+from jose import jwt
+
+# Suppress SSL warnings for self-signed certificates
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# HRMS API Configuration - Admin credentials for API authentication
+HRMS_BASE_URL = "https://abcl.myrecombd.com:9999"
+HRMS_USERNAME = "demo_admin"
+HRMS_PASSWORD = "Demo@2024"
+
+# Refresh the cached token this many seconds before the JWT actually expires
+TOKEN_EXPIRY_MARGIN = 60
+
+# Bearer token shared by every HRMS tool: {"token": str | None, "expires_at": float}
+_TOKEN: Dict[str, Any] = {"token": None, "expires_at": 0.0}
+_TOKEN_LOCK = threading.Lock()
+
+
+class _RefreshOn401(httpx.Auth):
+    """Retry a bearer-authenticated request once with a fresh token on 401.
+
+    A cached token can be revoked before its ``exp`` (e.g. the HRMS server
+    restarted with a new key); without this every tool would fail until it
+    expired. Requests without a bearer header (encrypt, login) pass through.
+    """
+
+    def auth_flow(self, request):
+        response = yield request
+
+        auth_header = request.headers.get("Authorization", "")
+        if response.status_code != 401 or not auth_header.startswith("Bearer "):
+            return
+
+        rejected = auth_header[len("Bearer "):]
+        invalidate_token(rejected)
+        token = get_token()
+        if token and token != rejected:
+            print("[HRMS] Token rejected (401), retrying with a fresh token", flush=True)
+            request.headers["Authorization"] = f"Bearer {token}"
+            yield request
+
+
+# One keep-alive connection pool shared by every HRMS tool
+_CLIENT = httpx.Client(verify=False, timeout=30.0, auth=_RefreshOn401())
+
+
+def hrms_client() -> httpx.Client:
+    """Return the shared httpx client for HRMS API calls."""
+    return _CLIENT
+
+
+def encrypt(value: str) -> Optional[str]:
+    """Encrypt a value using the HRMS encrypt endpoint."""
+    try:
+        response = _CLIENT.post(
+            f"{HRMS_BASE_URL}/encrypt",
+            json=value,
+            headers={"Content-Type": "application/json"}
+        )
+
+        if response.status_code == 200:
+            return response.text.strip().strip('"')
+        else:
+            print(f"[HRMS] Encrypt failed: HTTP {response.status_code}", flush=True)
+            return None
+    except Exception as e:
+        print(f"[HRMS] Encrypt error: {str(e)}", flush=True)
+        return None
+
+
+def _token_expiry(token: str) -> float:
+    """Return the time until which a token may be reused, or 0 if unknown."""
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except Exception:
+        return 0.0
+    if not exp:
+        return 0.0
+    return float(exp) - TOKEN_EXPIRY_MARGIN
+
+
+def _login() -> Optional[str]:
+    """Authenticate with HRMS and get a fresh bearer token."""
+    print("[HRMS] Authenticating...", flush=True)
+
+    # Encrypt credentials
+    encrypted_username = encrypt(HRMS_USERNAME)
+    encrypted_password = encrypt(HRMS_PASSWORD)
+
+    if not encrypted_username or not encrypted_password:
+        print("[HRMS] Failed to encrypt credentials", flush=True)
+        return None
+
+    # Login
+    try:
+        login_response = _CLIENT.post(
+            f"{HRMS_BASE_URL}/api/ControlPanel/Access/login",
+            json={
+                "username": encrypted_username,
+                "password": encrypted_password
+            },
+            headers={"Content-Type": "application/json"}
+        )
+
+        if login_response.status_code == 200:
+            data = login_response.json()
+            token = data.get("token") or data.get("access_token") or data.get("accessToken")
+            if token:
+                print("[HRMS] Authentication successful", flush=True)
+                return token
+
+        print(f"[HRMS] Login failed: {login_response.status_code}", flush=True)
+        return None
+
+    except Exception as e:
+        print(f"[HRMS] Login error: {str(e)}", flush=True)
+        return None
+
+
+def invalidate_token(token: str) -> None:
+    """Drop token from the cache if it is still the cached one."""
+    with _TOKEN_LOCK:
+        if _TOKEN["token"] == token:
+            _TOKEN["token"] = None
+            _TOKEN["expires_at"] = 0.0
+
+
+def get_token() -> Optional[str]:
+    """Return a valid HRMS bearer token, logging in only when needed.
+
+    The token is cached until shortly before its JWT ``exp`` claim, or until
+    the HRMS API rejects it with a 401. Tokens without a readable expiry are
+    not cached.
+    """
+    with _TOKEN_LOCK:
+        if _TOKEN["token"] and time.time() < _TOKEN["expires_at"]:
+            return _TOKEN["token"]
+
+        token = _login()
+        if token:
+            expires_at = _token_expiry(token)
+            _TOKEN["token"] = token if expires_at else None
+            _TOKEN["expires_at"] = expires_at
+        return token
@@ -9,87 +9,17 @@
 
 from typing import Annotated, Optional
 from datetime import datetime
-import httpx
-import urllib3
 import json
 from app.workflows.tools import tool_registry
+from app.workflows.tools._hrms_http import HRMS_BASE_URL, hrms_client, get_token
 from app.workflows.context import get_employee_id
 from app.workflows.prompt_loader import should_require_approval
 from langgraph.types import interrupt
 
-# Suppress SSL warnings for self-signed certificates
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-# HRMS API Configuration - Admin credentials for API authentication
-HRMS_BASE_URL = "https://abcl.myrecombd.com:9999"
-HRMS_USERNAME = "demo_admin"
-HRMS_PASSWORD = "Demo@2024"
-
 # Default values (can be overridden)
 DEFAULT_EMPLOYEE_ID = 335  # Fallback if no context available
 
 
-def _encrypt_value(value: str) -> Optional[str]:
-    """Encrypt a value using the HRMS encrypt endpoint."""
-    try:
-        response = httpx.post(
-            f"{HRMS_BASE_URL}/encrypt",
-            json=value,
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
-            verify=False
-        )
-        
-        if response.status_code == 200:
-            return response.text.strip().strip('"')
-        else:
-            print(f"[HRMS] Encrypt failed: HTTP {response.status_code}", flush=True)
-            return None
-    except Exception as e:
-        print(f"[HRMS] Encrypt error: {str(e)}", flush=True)
-        return None
-
-
-def _get_hrms_token() -> Optional[str]:
-    """Authenticate with HRMS and get bearer token."""
-    print("[HRMS] Authenticating...", flush=True)
-    
-    # Encrypt credentials
-    encrypted_username = _encrypt_value(HRMS_USERNAME)
-    encrypted_password = _encrypt_value(HRMS_PASSWORD)
-    
-    if not encrypted_username or not encrypted_password:
-        print("[HRMS] Failed to encrypt credentials", flush=True)
-        return None
-    
-    # Login
-    try:
-        login_response = httpx.post(
-            f"{HRMS_BASE_URL}/api/ControlPanel/Access/login",
-            json={
-                "username": encrypted_username,
-                "password": encrypted_password
-            },
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
-            verify=False
-        )
-        
-        if login_response.status_code == 200:
-            data = login_response.json()
-            token = data.get("token") or data.get("access_token") or data.get("accessToken")
-            if token:
-                print("[HRMS] Authentication successful", flush=True)
-                return token
-            
-        print(f"[HRMS] Login failed: {login_response.status_code}", flush=True)
-        return None
-            
-    except Exception as e:
-        print(f"[HRMS] Login error: {str(e)}", flush=True)
-        return None
-
-
 def _format_attendance_date(date_str: str) -> str:
     """Convert date string to ISO datetime format for attendance (YYYY-MM-DDTHH:mm:ss.000Z)."""
     current_year = datetime.now().year
@@ -313,7 +243,7 @@ def apply_for_manual_attendance(
         print("[HRMS] HITL: User approved attendance application", flush=True)
     
     # Step 1: Authenticate
-    token = _get_hrms_token()
+    token = get_token()
     if not token:
         return "❌ Failed to authenticate with HRMS system."
     
@@ -358,12 +288,11 @@ def apply_for_manual_attendance(
         print("-" * 70, flush=True)
         
         # Step 3: Submit Manual Attendance Request
-        attendance_response = httpx.post(
+        attendance_response = hrms_client().post(
             f"{HRMS_BASE_URL}/api/hrms/Attendance/ManualAttendance/SaveManualAttendance",
             json=request_body,
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         
         print("="*70, flush=True)
@@ -8,81 +8,12 @@
 from typing import Annotated, Optional, Dict, Any, List
 from datetime import datetime
 import httpx
-import urllib3
 import json
 from app.workflows.tools import tool_registry
+from app.workflows.tools._hrms_http import HRMS_BASE_URL, hrms_client, get_token
 from app.workflows.prompt_loader import should_require_approval
 from langgraph.types import interrupt
 
-# Suppress SSL warnings for self-signed certificates
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-# HRMS API Configuration - Admin credentials for API authentication
-HRMS_BASE_URL = "https://abcl.myrecombd.com:9999"
-HRMS_USERNAME = "demo_admin"
-HRMS_PASSWORD = "Demo@2024"
-
-
-def _encrypt_value(value: str) -> Optional[str]:
-    """Encrypt a value using the HRMS encrypt endpoint."""
-    try:
-        response = httpx.post(
-            f"{HRMS_BASE_URL}/encrypt",
-            json=value,
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
-            verify=False
-        )
-        
-        if response.status_code == 200:
-            return response.text.strip().strip('"')
-        else:
-            print(f"[HRMS Admin] Encrypt failed: HTTP {response.status_code}", flush=True)
-            return None
-    except Exception as e:
-        print(f"[HRMS Admin] Encrypt error: {str(e)}", flush=True)
-        return None
-
-
-def _get_hrms_token() -> Optional[str]:
-    """Authenticate with HRMS and get bearer token."""
-    print("[HRMS Admin] Authenticating...", flush=True)
-    
-    # Encrypt credentials
-    encrypted_username = _encrypt_value(HRMS_USERNAME)
-    encrypted_password = _encrypt_value(HRMS_PASSWORD)
-    
-    if not encrypted_username or not encrypted_password:
-        print("[HRMS Admin] Failed to encrypt credentials", flush=True)
-        return None
-    
-    # Login
-    try:
-        login_response = httpx.post(
-            f"{HRMS_BASE_URL}/api/ControlPanel/Access/login",
-            json={
-                "username": encrypted_username,
-                "password": encrypted_password
-            },
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
-            verify=False
-        )
-        
-        if login_response.status_code == 200:
-            data = login_response.json()
-            token = data.get("token") or data.get("access_token") or data.get("accessToken")
-            if token:
-                print("[HRMS Admin] Authentication successful", flush=True)
-                return token
-            
-        print(f"[HRMS Admin] Login failed: {login_response.status_code}", flush=True)
-        return None
-            
-    except Exception as e:
-        print(f"[HRMS Admin] Login error: {str(e)}", flush=True)
-        return None
-
 
 def _format_datetime(date_str: str) -> str:
     """Convert date string to ISO datetime format."""
@@ -139,11 +70,10 @@ def _search_employee_by_name(token: str, employee_name: str) -> Optional[Dict]:
     print(f"[HRMS Admin] Searching for employee: {employee_name}", flush=True)
     
     try:
-        response = httpx.get(
+        response = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Employee/Info/GetEmployeeServiceData",
             headers={"Authorization": f"Bearer {token}"},
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         
         if response.status_code != 200:
@@ -367,7 +297,7 @@ def cancel_attendance_for_employee(
     print("-" * 70, flush=True)
     
     # Authenticate
-    token = _get_hrms_token()
+    token = get_token()
     if not token:
         return "❌ Failed to authenticate with HRMS system."
     
@@ -399,7 +329,7 @@ def cancel_attendance_for_employee(
     # Step 2: Get Employee Manual Attendances
     print("[HRMS Admin] Step 2/6: GetEmployeeManualAttendances (finding matching attendance request)...", flush=True)
     try:
-        resp2 = httpx.get(
+        resp2 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/hrms/Attendance/ManualAttendance/GetEmployeeManualAttendances",
             params={
                 "employeeId": employee_id,
@@ -407,8 +337,7 @@ def cancel_attendance_for_employee(
                 "pageNumber": 1
             },
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 2 complete (Status: {resp2.status_code})", flush=True)
         
@@ -528,28 +457,26 @@ def cancel_attendance_for_employee(
     try:
         # Step 3: Get Employee Manual Attendance by ID
         print("[HRMS Admin] Step 3/6: GetEmployeeManualAttendances (by ID)...", flush=True)
-        resp3 = httpx.get(
+        resp3 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/hrms/Attendance/ManualAttendance/GetEmployeeManualAttendances",
             params={
                 "manualAttendanceId": manual_attendance_id
             },
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 3 complete (Status: {resp3.status_code})", flush=True)
         
         # Step 4: Cancel Manual Attendance
         print("[HRMS Admin] Step 4/6: CancelRequest (cancelling attendance request)...", flush=True)
-        resp4 = httpx.post(
+        resp4 = hrms_client().post(
             f"{HRMS_BASE_URL}/api/hrms/Attendance/ManualAttendance/CancelRequest",
             json={
                 "id": manual_attendance_id,
                 "reason": remarks
             },
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 4 complete (Status: {resp4.status_code})", flush=True)
         
@@ -570,18 +497,17 @@ def cancel_attendance_for_employee(
         
         # Step 5: Send Email
         print("[HRMS Admin] Step 5/6: SendEmail (sending cancellation email)...", flush=True)
-        resp5 = httpx.post(
+        resp5 = hrms_client().post(
             f"{HRMS_BASE_URL}/api/hrms/Attendance/ManualAttendance/SendEmail",
             json=cancel_result,  # Use response from Step 4
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 5 complete (Status: {resp5.status_code})", flush=True)
         
         # Step 6: Get Subordinates Manual Attendances Requests (Final Verification)
         print("[HRMS Admin] Step 6/6: GetSubordinatesManualAttendancesRequests (final verification)...", flush=True)
-        resp6 = httpx.get(
+        resp6 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/hrms/Attendance/ManualAttendance/GetSubordinatesManualAttendancesRequests",
             params={
                 "timeRequestFor": "",
@@ -592,8 +518,7 @@ def cancel_attendance_for_employee(
                 "pageNumber": 1
             },
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 6 complete (Status: {resp6.status_code})", flush=True)
         
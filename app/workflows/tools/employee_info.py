@@ -5,85 +5,15 @@
 """
 
 from typing import Annotated, Optional
-import httpx
-import urllib3
 import json
 from app.workflows.tools import tool_registry
+from app.workflows.tools._hrms_http import HRMS_BASE_URL, hrms_client, get_token
 from app.workflows.context import get_employee_id
 
-# Suppress SSL warnings for self-signed certificates
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-# HRMS API Configuration - Admin credentials for API authentication
-HRMS_BASE_URL = "https://abcl.myrecombd.com:9999"
-HRMS_USERNAME = "demo_admin"
-HRMS_PASSWORD = "Demo@2024"
-
 # Default values (can be overridden)
 DEFAULT_EMPLOYEE_ID = 335  # Fallback if no context available
 
 
-def _encrypt_value(value: str) -> Optional[str]:
-    """Encrypt a value using the HRMS encrypt endpoint."""
-    try:
-        response = httpx.post(
-            f"{HRMS_BASE_URL}/encrypt",
-            json=value,
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
-            verify=False
-        )
-        
-        if response.status_code == 200:
-            return response.text.strip().strip('"')
-        else:
-            print(f"[HRMS] Encrypt failed: HTTP {response.status_code}", flush=True)
-            return None
-    except Exception as e:
-        print(f"[HRMS] Encrypt error: {str(e)}", flush=True)
-        return None
-
-
-def _get_hrms_token() -> Optional[str]:
-    """Authenticate with HRMS and get bearer token."""
-    print("[HRMS] Authenticating...", flush=True)
-    
-    # Encrypt credentials
-    encrypted_username = _encrypt_value(HRMS_USERNAME)
-    encrypted_password = _encrypt_value(HRMS_PASSWORD)
-    
-    if not encrypted_username or not encrypted_password:
-        print("[HRMS] Failed to encrypt credentials", flush=True)
-        return None
-    
-    # Login
-    try:
-        login_response = httpx.post(
-            f"{HRMS_BASE_URL}/api/ControlPanel/Access/login",
-            json={
-                "username": encrypted_username,
-                "password": encrypted_password
-            },
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
-            verify=False
-        )
-        
-        if login_response.status_code == 200:
-            data = login_response.json()
-            token = data.get("token") or data.get("access_token") or data.get("accessToken")
-            if token:
-                print("[HRMS] Authentication successful", flush=True)
-                return token
-            
-        print(f"[HRMS] Login failed: {login_response.status_code}", flush=True)
-        return None
-            
-    except Exception as e:
-        print(f"[HRMS] Login error: {str(e)}", flush=True)
-        return None
-
-
 @tool_registry.register
 def get_employee_info(
     employee_id: Annotated[Optional[int], "Employee ID (optional, defaults to logged-in user)"] = None
@@ -126,7 +56,7 @@ def get_employee_info(
     print("-" * 70, flush=True)
     
     # Step 1: Authenticate
-    token = _get_hrms_token()
+    token = get_token()
     if not token:
         return "❌ Failed to authenticate with HRMS system. Please try again later."
     
@@ -135,12 +65,11 @@ def get_employee_info(
     try:
         # Step 2: Get Employee Personal Information
         print("[HRMS] Fetching employee information...", flush=True)
-        info_response = httpx.get(
+        info_response = hrms_client().get(
             f"{HRMS_BASE_URL}/api/hrms/Employee/Info/GetEmployeePersonalInfoById",
             params={"employeeId": employee_id},
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         
         print(f"[HRMS] Response Status: {info_response.status_code}", flush=True)
@@ -152,13 +81,13 @@ def get_employee_info(
             try:
                 employee_data = info_response.json()
                 
-                print(f"[HRMS] DEBUG - Parsed JSON Response:", flush=True)
-                print(json.dumps(employee_data, indent=2, default=str), flush=True)
-                print("-" * 70, flush=True)
-                
                 # Return the full JSON response as a formatted string
                 json_response = json.dumps(employee_data, indent=2, default=str)
                 
+                print(f"[HRMS] DEBUG - Parsed JSON Response:", flush=True)
+                print(json_response, flush=True)
+                print("-" * 70, flush=True)
+                
                 print("[HRMS] ✓ Employee information retrieved successfully", flush=True)
                 print("="*70 + "\n", flush=True)
                 return json_response
@@ -14,89 +14,19 @@
 
 from typing import Annotated, Optional, Dict, Any, List
 from datetime import datetime, timedelta
-import httpx
-import urllib3
 import json
 from app.workflows.tools import tool_registry
+from app.workflows.tools._hrms_http import HRMS_BASE_URL, hrms_client, get_token
 from app.workflows.context import get_employee_id
 from app.workflows.prompt_loader import should_require_approval
 from langgraph.types import interrupt
 
-# Suppress SSL warnings for self-signed certificates
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-# HRMS API Configuration - Admin credentials for API authentication
-HRMS_BASE_URL = "https://abcl.myrecombd.com:9999"
-HRMS_USERNAME = "demo_admin"
-HRMS_PASSWORD = "Demo@2024"
-
 # Default values (can be overridden)
 DEFAULT_EMPLOYEE_ID = 335  # Fallback if no context available
 DEFAULT_LEAVE_TYPE_ID = 2  # Sick Leave (most common, widely available)
 DEFAULT_UNIT_ID = None
 
 
-def _encrypt_value(value: str) -> Optional[str]:
-    """Encrypt a value using the HRMS encrypt endpoint."""
-    try:
-        response = httpx.post(
-            f"{HRMS_BASE_URL}/encrypt",
-            json=value,
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
-            verify=False
-        )
-        
-        if response.status_code == 200:
-            return response.text.strip().strip('"')
-        else:
-            print(f"[HRMS] Encrypt failed: HTTP {response.status_code}", flush=True)
-            return None
-    except Exception as e:
-        print(f"[HRMS] Encrypt error: {str(e)}", flush=True)
-        return None
-
-
-def _get_hrms_token() -> Optional[str]:
-    """Authenticate with HRMS and get bearer token."""
-    print("[HRMS] Authenticating...", flush=True)
-    
-    # Encrypt credentials
-    encrypted_username = _encrypt_value(HRMS_USERNAME)
-    encrypted_password = _encrypt_value(HRMS_PASSWORD)
-    
-    if not encrypted_username or not encrypted_password:
-        print("[HRMS] Failed to encrypt credentials", flush=True)
-        return None
-    
-    # Login
-    try:
-        login_response = httpx.post(
-            f"{HRMS_BASE_URL}/api/ControlPanel/Access/login",
-            json={
-                "username": encrypted_username,
-                "password": encrypted_password
-            },
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
-            verify=False
-        )
-        
-        if login_response.status_code == 200:
-            data = login_response.json()
-            token = data.get("token") or data.get("access_token") or data.get("accessToken")
-            if token:
-                print("[HRMS] Authentication successful", flush=True)
-                return token
-            
-        print(f"[HRMS] Login failed: {login_response.status_code}", flush=True)
-        return None
-            
-    except Exception as e:
-        print(f"[HRMS] Login error: {str(e)}", flush=True)
-        return None
-
-
 def _format_datetime(date_str: str) -> str:
     """Convert date string to ISO datetime format."""
     current_year = datetime.now().year
@@ -270,7 +200,7 @@ def apply_for_leave(
         print("[HRMS] HITL: User approved leave application", flush=True)
     
     # Step 1: Authenticate
-    token = _get_hrms_token()
+    token = get_token()
     if not token:
         return "❌ Failed to authenticate with HRMS system."
     
@@ -279,12 +209,11 @@ def apply_for_leave(
     try:
         # Step 2: Get Leave Balance
         print("[HRMS] Step 1/6: Fetching leave balance...", flush=True)
-        balance_response = httpx.get(
+        balance_response = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/EmployeeLeaveBalance/GetLeaveBalance",
             params={"employeeId": employee_id},
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS] ✓ Leave balance fetched (Status: {balance_response.status_code})", flush=True)
         print(f"[HRMS] DEBUG - Balance Response Body:", flush=True)
@@ -293,12 +222,11 @@ def apply_for_leave(
         
         # Step 3: Get Leave Period
         print("[HRMS] Step 2/6: Fetching leave period settings...", flush=True)
-        period_response = httpx.get(
+        period_response = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/LeaveSetting/GetLeavePeriod",
             params={"employeeId": employee_id},
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS] ✓ Leave period fetched (Status: {period_response.status_code})", flush=True)
         print(f"[HRMS] DEBUG - Period Response Body:", flush=True)
@@ -307,12 +235,11 @@ def apply_for_leave(
         
         # Step 4: Get Leave Types Dropdown
         print("[HRMS] Step 3/6: Fetching leave types...", flush=True)
-        types_response = httpx.get(
+        types_response = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/EmployeeLeaveBalance/GetEmployeeLeaveBalancesDropdown",
             params={"employeeId": employee_id},
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS] ✓ Leave types fetched (Status: {types_response.status_code})", flush=True)
         print(f"[HRMS] DEBUG - Leave Types Response Body:", flush=True)
@@ -321,12 +248,11 @@ def apply_for_leave(
         
         # Step 5: Get Mobile Number
         print("[HRMS] Step 4/6: Fetching employee mobile number...", flush=True)
-        mobile_response = httpx.get(
+        mobile_response = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Employee/Info/GetEmployeePersonalMobileNumberByEmployeeId",
             params={"id": employee_id},
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS] Mobile Response (Status: {mobile_response.status_code}):", flush=True)
         print(f"[HRMS] DEBUG - Mobile Response Body:", flush=True)
@@ -356,12 +282,11 @@ def apply_for_leave(
         
         # Step 6: Get Address
         print("[HRMS] Step 5/6: Fetching employee address...", flush=True)
-        address_response = httpx.get(
+        address_response = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Employee/Info/GetEmployeePresentAddressByEmployeeId",
             params={"id": employee_id},
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS] Address Response (Status: {address_response.status_code}):", flush=True)
         print(f"[HRMS] DEBUG - Address Response Body:", flush=True)
@@ -391,7 +316,7 @@ def apply_for_leave(
         
         # Step 7: Calculate Total Request Days
         print("[HRMS] Step 6/6: Calculating total request days...", flush=True)
-        days_response = httpx.get(
+        days_response = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/LeaveSetting/GetTotalRequestDays",
             params={
                 "EmployeeLeaveRequestId": 0,
@@ -401,8 +326,7 @@ def apply_for_leave(
                 "AppliedToDate": to_date
             },
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS] Days Calculation Response (Status: {days_response.status_code}):", flush=True)
         print(f"[HRMS] DEBUG - Days Response Body:", flush=True)
@@ -497,14 +421,13 @@ def apply_for_leave(
         print(f"[HRMS] DEBUG - Full payload:", flush=True)
         print(json.dumps(request_body, indent=2), flush=True)
         
-        leave_response = httpx.post(
+        leave_response = hrms_client().post(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/LeaveRequest/SaveEmployeeLeaveRequest3",
             data=request_body,  # Send as form data (x-www-form-urlencoded)
             headers={
                 "Authorization": f"Bearer {token}"
             },
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         
         print("="*70, flush=True)
@@ -8,85 +8,16 @@
 from typing import Annotated, Optional, Dict, Any, List
 from datetime import datetime, timedelta
 import httpx
-import urllib3
 import json
 from app.workflows.tools import tool_registry
+from app.workflows.tools._hrms_http import HRMS_BASE_URL, hrms_client, get_token
 from app.workflows.prompt_loader import should_require_approval
 from langgraph.types import interrupt
 
-# Suppress SSL warnings for self-signed certificates
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-# HRMS API Configuration - Admin credentials for API authentication
-HRMS_BASE_URL = "https://abcl.myrecombd.com:9999"
-HRMS_USERNAME = "demo_admin"
-HRMS_PASSWORD = "Demo@2024"
-
 # Default values
 DEFAULT_LEAVE_TYPE_ID = 2  # Sick Leave
 
 
-def _encrypt_value(value: str) -> Optional[str]:
-    """Encrypt a value using the HRMS encrypt endpoint."""
-    try:
-        response = httpx.post(
-            f"{HRMS_BASE_URL}/encrypt",
-            json=value,
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
-            verify=False
-        )
-        
-        if response.status_code == 200:
-            return response.text.strip().strip('"')
-        else:
-            print(f"[HRMS Admin] Encrypt failed: HTTP {response.status_code}", flush=True)
-            return None
-    except Exception as e:
-        print(f"[HRMS Admin] Encrypt error: {str(e)}", flush=True)
-        return None
-
-
-def _get_hrms_token() -> Optional[str]:
-    """Authenticate with HRMS and get bearer token."""
-    print("[HRMS Admin] Authenticating...", flush=True)
-    
-    # Encrypt credentials
-    encrypted_username = _encrypt_value(HRMS_USERNAME)
-    encrypted_password = _encrypt_value(HRMS_PASSWORD)
-    
-    if not encrypted_username or not encrypted_password:
-        print("[HRMS Admin] Failed to encrypt credentials", flush=True)
-        return None
-    
-    # Login
-    try:
-        login_response = httpx.post(
-            f"{HRMS_BASE_URL}/api/ControlPanel/Access/login",
-            json={
-                "username": encrypted_username,
-                "password": encrypted_password
-            },
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
-            verify=False
-        )
-        
-        if login_response.status_code == 200:
-            data = login_response.json()
-            token = data.get("token") or data.get("access_token") or data.get("accessToken")
-            if token:
-                print("[HRMS Admin] Authentication successful", flush=True)
-                return token
-            
-        print(f"[HRMS Admin] Login failed: {login_response.status_code}", flush=True)
-        return None
-            
-    except Exception as e:
-        print(f"[HRMS Admin] Login error: {str(e)}", flush=True)
-        return None
-
-
 def _format_datetime(date_str: str) -> str:
     """Convert date string to ISO datetime format."""
     current_year = datetime.now().year
@@ -148,11 +79,10 @@ def _search_employee_by_name(token: str, employee_name: str) -> Optional[Dict]:
     print(f"[HRMS Admin] Searching for employee: {employee_name}", flush=True)
     
     try:
-        response = httpx.get(
+        response = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Employee/Info/GetEmployeeServiceData",
             headers={"Authorization": f"Bearer {token}"},
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         
         if response.status_code != 200:
@@ -270,7 +200,7 @@ def apply_leave_for_employee(
     print("-" * 70, flush=True)
     
     # Step 1: Authenticate
-    token = _get_hrms_token()
+    token = get_token()
     if not token:
         return "❌ Failed to authenticate with HRMS system."
     
@@ -348,22 +278,22 @@ def apply_leave_for_employee(
     try:
         # Endpoint 1: GetEmployeeServiceData (already called for search, but call again as per workflow)
         print("[HRMS Admin] Step 1/18: GetEmployeeServiceData...", flush=True)
-        resp1 = httpx.get(
+        resp1 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Employee/Info/GetEmployeeServiceData",
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 1 complete (Status: {resp1.status_code})", flush=True)
         
         # Endpoint 2: GetEmployeeLeaveRequests
         print("[HRMS Admin] Step 2/18: GetEmployeeLeaveRequests...", flush=True)
-        resp2 = httpx.get(
+        resp2 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/LeaveRequest/GetEmployeeLeaveRequests",
             params={
                 "month": 0, "year": 0, "employeeId": employee_id, "leaveTypeId": 0,
                 "dayLeaveType": "", "appliedFromDate": "", "appliedToDate": "",
                 "stateStatus": "", "pageNumber": 1, "pageSize": 15
             },
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 2 complete (Status: {resp2.status_code})", flush=True)
         
@@ -386,53 +316,53 @@ def apply_leave_for_employee(
         
         # Endpoint 3: GetLeaveTypesDropdown
         print("[HRMS Admin] Step 3/18: GetLeaveTypesDropdown...", flush=True)
-        resp3 = httpx.get(
+        resp3 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/LeaveType/GetLeaveTypesDropdown",
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 3 complete (Status: {resp3.status_code})", flush=True)
         
         # Endpoint 4: GetEmployeeServiceData (again)
         print("[HRMS Admin] Step 4/18: GetEmployeeServiceData (again)...", flush=True)
-        resp4 = httpx.get(
+        resp4 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Employee/Info/GetEmployeeServiceData",
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 4 complete (Status: {resp4.status_code})", flush=True)
         
         # Endpoint 5: GetLeavePeriod
         print("[HRMS Admin] Step 5/18: GetLeavePeriod...", flush=True)
-        resp5 = httpx.get(
+        resp5 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/LeaveSetting/GetLeavePeriod",
             params={"employeeId": employee_id},
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 5 complete (Status: {resp5.status_code})", flush=True)
         
         # Endpoint 6: GetLeaveBalance
         print("[HRMS Admin] Step 6/18: GetLeaveBalance...", flush=True)
-        resp6 = httpx.get(
+        resp6 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/EmployeeLeaveBalance/GetLeaveBalance",
             params={"employeeId": employee_id},
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 6 complete (Status: {resp6.status_code})", flush=True)
         
         # Endpoint 7: GetEmployeeLeaveBalancesDropdown
         print("[HRMS Admin] Step 7/18: GetEmployeeLeaveBalancesDropdown...", flush=True)
-        resp7 = httpx.get(
+        resp7 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/EmployeeLeaveBalance/GetEmployeeLeaveBalancesDropdown",
             params={"employeeId": employee_id},
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 7 complete (Status: {resp7.status_code})", flush=True)
         
         # Endpoint 8: GetEmployeeActiveHierarchy (validate hierarchy)
         print("[HRMS Admin] Step 8/18: GetEmployeeActiveHierarchy (validating hierarchy)...", flush=True)
-        resp8 = httpx.get(
+        resp8 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Employee/Hierarchy/GetEmployeeActiveHierarchy",
             params={"id": employee_id},
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 8 complete (Status: {resp8.status_code})", flush=True)
         
@@ -441,17 +371,17 @@ def apply_leave_for_employee(
         
         # Endpoint 9: GetLeaveTypeSetting
         print("[HRMS Admin] Step 9/18: GetLeaveTypeSetting...", flush=True)
-        resp9 = httpx.get(
+        resp9 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/LeaveSetting/GetLeaveTypeSetting",
             params={"leaveTypeId": leave_type_id, "employeeId": employee_id},
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 9 complete (Status: {resp9.status_code})", flush=True)
         
         # Endpoint 10: GetTotalRequestDays
         print("[HRMS Admin] Step 10/18: GetTotalRequestDays (calculating days)...", flush=True)
         half_day_param = "Second Portion" if day_leave_type == "Half-Day" else None
-        resp10 = httpx.get(
+        resp10 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/LeaveSetting/GetTotalRequestDays",
             params={
                 "EmployeeLeaveRequestId": 0,
@@ -461,7 +391,7 @@ def apply_leave_for_employee(
                 "AppliedToDate": to_date,
                 "halfDayType": half_day_param
             },
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 10 complete (Status: {resp10.status_code})", flush=True)
         
@@ -525,12 +455,11 @@ def apply_leave_for_employee(
             "EstimatedDeliveryDate": ""
         }
         
-        resp11 = httpx.post(
+        resp11 = hrms_client().post(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/LeaveRequest/SaveEmployeeLeaveRequest3",
             data=request_body,
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         
         print(f"[HRMS Admin] ✓ Step 11 complete (Status: {resp11.status_code})", flush=True)
@@ -553,42 +482,42 @@ def apply_leave_for_employee(
         
         # Endpoint 12: GetCompanyHolidayAndEvents
         print("[HRMS Admin] Step 12/18: GetCompanyHolidayAndEvents...", flush=True)
-        resp12 = httpx.get(
+        resp12 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/hrms/dashboard/CommonDashboard/GetCompanyHolidayAndEvents",
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 12 complete (Status: {resp12.status_code})", flush=True)
         
         # Endpoint 13: GetMyLeaveAppliedRecords
         print("[HRMS Admin] Step 13/18: GetMyLeaveAppliedRecords...", flush=True)
-        resp13 = httpx.get(
+        resp13 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/hrms/dashboard/LeaveCommonDashboard/GetMyLeaveAppliedRecords",
             params={"pageNumber": 1, "pageSize": 5},
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 13 complete (Status: {resp13.status_code})", flush=True)
         
         # Endpoint 14: GetEmployeesLeaveApproval
         print("[HRMS Admin] Step 14/18: GetEmployeesLeaveApproval...", flush=True)
-        resp14 = httpx.get(
+        resp14 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/hrms/dashboard/EmployeeLeaveDetails/GetEmployeesLeaveApproval",
             params={"pageSize": 5},
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 14 complete (Status: {resp14.status_code})", flush=True)
         
         # Endpoint 15: GetSubordinatesLeaveApproval
         print("[HRMS Admin] Step 15/18: GetSubordinatesLeaveApproval...", flush=True)
-        resp15 = httpx.get(
+        resp15 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/hrms/dashboard/SubordinatesLeave/GetSubordinatesLeaveApproval",
             params={"pageNumber": 1, "pageSize": 5},
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 15 complete (Status: {resp15.status_code})", flush=True)
         
         # Endpoint 16: EmployeeLeaveBalancesforSuperviserteam
         print("[HRMS Admin] Step 16/18: EmployeeLeaveBalancesforSuperviserteam...", flush=True)
-        resp16 = httpx.post(
+        resp16 = hrms_client().post(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/EmployeeLeaveBalance/EmployeeLeaveBalancesforSuperviserteam",
             json={
                 "employeeId": employee_id,
@@ -597,7 +526,7 @@ def apply_leave_for_employee(
                 "pageNumber": 1,
                 "pageSize": 15
             },
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 16 complete (Status: {resp16.status_code})", flush=True)
         
@@ -607,25 +536,24 @@ def apply_leave_for_employee(
         # Get the response from resp11 (leave apply endpoint) to use as payload
         # Use json= instead of data= to send as JSON with correct Content-Type header
         resp11_json = resp11.json() if resp11.status_code == 200 else {}
-        resp17 = httpx.post(
+        resp17 = hrms_client().post(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/LeaveRequest/SendLeaveEmail",
             json=resp11_json,
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 17 complete (Status: {resp17.status_code})", flush=True)
         
         # Endpoint 18: GetEmployeeLeaveRequests (again)
         print("[HRMS Admin] Step 18/18: GetEmployeeLeaveRequests (final check)...", flush=True)
-        resp18 = httpx.get(
+        resp18 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/LeaveRequest/GetEmployeeLeaveRequests",
             params={
                 "month": 0, "year": 0, "employeeId": employee_id, "leaveTypeId": 0,
                 "dayLeaveType": "", "appliedFromDate": "", "appliedToDate": "",
                 "stateStatus": "", "pageNumber": 1, "pageSize": 15
             },
-            headers=headers, timeout=30.0, verify=False
+            headers=headers, timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 18 complete (Status: {resp18.status_code})", flush=True)
         
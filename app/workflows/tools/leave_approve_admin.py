@@ -8,82 +8,13 @@
 from typing import Annotated, Optional, Dict, Any, List
 from datetime import datetime
 import httpx
-import urllib3
 import json
 from app.workflows.tools import tool_registry
+from app.workflows.tools._hrms_http import HRMS_BASE_URL, hrms_client, get_token
 from app.workflows.prompt_loader import should_require_approval, should_use_multi_step
 from langgraph.types import interrupt
 from langgraph.errors import GraphInterrupt
 
-# Suppress SSL warnings for self-signed certificates
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-# HRMS API Configuration - Admin credentials for API authentication
-HRMS_BASE_URL = "https://abcl.myrecombd.com:9999"
-HRMS_USERNAME = "demo_admin"
-HRMS_PASSWORD = "Demo@2024"
-
-
-def _encrypt_value(value: str) -> Optional[str]:
-    """Encrypt a value using the HRMS encrypt endpoint."""
-    try:
-        response = httpx.post(
-            f"{HRMS_BASE_URL}/encrypt",
-            json=value,
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
-            verify=False
-        )
-        
-        if response.status_code == 200:
-            return response.text.strip().strip('"')
-        else:
-            print(f"[HRMS Admin] Encrypt failed: HTTP {response.status_code}", flush=True)
-            return None
-    except Exception as e:
-        print(f"[HRMS Admin] Encrypt error: {str(e)}", flush=True)
-        return None
-
-
-def _get_hrms_token() -> Optional[str]:
-    """Authenticate with HRMS and get bearer token."""
-    print("[HRMS Admin] Authenticating...", flush=True)
-    
-    # Encrypt credentials
-    encrypted_username = _encrypt_value(HRMS_USERNAME)
-    encrypted_password = _encrypt_value(HRMS_PASSWORD)
-    
-    if not encrypted_username or not encrypted_password:
-        print("[HRMS Admin] Failed to encrypt credentials", flush=True)
-        return None
-    
-    # Login
-    try:
-        login_response = httpx.post(
-            f"{HRMS_BASE_URL}/api/ControlPanel/Access/login",
-            json={
-                "username": encrypted_username,
-                "password": encrypted_password
-            },
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
-            verify=False
-        )
-        
-        if login_response.status_code == 200:
-            data = login_response.json()
-            token = data.get("token") or data.get("access_token") or data.get("accessToken")
-            if token:
-                print("[HRMS Admin] Authentication successful", flush=True)
-                return token
-            
-        print(f"[HRMS Admin] Login failed: {login_response.status_code}", flush=True)
-        return None
-            
-    except Exception as e:
-        print(f"[HRMS Admin] Login error: {str(e)}", flush=True)
-        return None
-
 
 def _format_datetime(date_str: str) -> str:
     """Convert date string to ISO datetime format."""
@@ -140,11 +71,10 @@ def _search_employee_by_name(token: str, employee_name: str) -> Optional[Dict]:
     print(f"[HRMS Admin] Searching for employee: {employee_name}", flush=True)
     
     try:
-        response = httpx.get(
+        response = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Employee/Info/GetEmployeeServiceData",
             headers={"Authorization": f"Bearer {token}"},
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         
         if response.status_code != 200:
@@ -325,7 +255,7 @@ def approve_leave_for_employee(
     print("-" * 70, flush=True)
     
     # Step 1: Authenticate
-    token = _get_hrms_token()
+    token = get_token()
     if not token:
         return "❌ Failed to authenticate with HRMS system."
     
@@ -334,12 +264,11 @@ def approve_leave_for_employee(
     # Step 1: Get Branch
     print("[HRMS Admin] Step 1/9: GetBranchExtension...", flush=True)
     try:
-        resp1 = httpx.get(
+        resp1 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/ws/controlPanelService/GetBranchExtension",
             params={"flag": 7, "ComId": 3, "OrgId": 5},
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 1 complete (Status: {resp1.status_code})", flush=True)
     except Exception as e:
@@ -395,7 +324,7 @@ def approve_leave_for_employee(
     # Step 3: Get Employee Leave Requests
     print("[HRMS Admin] Step 3/9: GetEmployeeLeaveRequests (finding matching leave request)...", flush=True)
     try:
-        resp3 = httpx.get(
+        resp3 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/LeaveRequest/GetEmployeeLeaveRequests",
             params={
                 "month": 0,
@@ -410,8 +339,7 @@ def approve_leave_for_employee(
                 "pageSize": 15
             },
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 3 complete (Status: {resp3.status_code})", flush=True)
         
@@ -544,21 +472,20 @@ def approve_leave_for_employee(
     try:
         # Step 4: Get Employee Leave Request By Id
         print("[HRMS Admin] Step 4/9: GetEmployeeLeaveRequestById...", flush=True)
-        resp4 = httpx.get(
+        resp4 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/hrms/leave/LeaveRequest/GetEmployeeLeaveRequestById",
             params={
                 "employeeId": employee_id,
                 "employeeLeaveRequestId": employee_leave_request_id
             },
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 4 complete (Status: {resp4.status_code})", flush=True)
         
         # Step 5: Get Total Request Days
         print("[HRMS Admin] Step 5/9: GetTotalRequestDays...", flush=True)
-        resp5 = httpx.get(
+        resp5 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/hrms/Leave/LeaveSetting/GetTotalRequestDays",
             params={
                 "employeeLeaveRequestId": employee_leave_request_id,
@@ -568,25 +495,23 @@ def approve_leave_for_employee(
                 "appliedToDate": applied_to_date
             },
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 5 complete (Status: {resp5.status_code})", flush=True)
         
         # Step 6: Employee Leave Balance
         print("[HRMS Admin] Step 6/9: GetLeaveBalance...", flush=True)
-        resp6 = httpx.get(
+        resp6 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/hrms/leave/employeeLeaveBalance/GetLeaveBalance",
             params={"employeeId": employee_id},
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 6 complete (Status: {resp6.status_code})", flush=True)
         
         # Step 7: Approve Leave
         print("[HRMS Admin] Step 7/9: LeaveRequestApproval (approving leave request)...", flush=True)
-        resp7 = httpx.post(
+        resp7 = hrms_client().post(
             f"{HRMS_BASE_URL}/api/hrms/Leave/LeaveRequest/LeaveRequestApproval",
             json={
                 "employeeId": employee_id,
@@ -595,8 +520,7 @@ def approve_leave_for_employee(
                 "stateStatus": "Approved"
             },
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 7 complete (Status: {resp7.status_code})", flush=True)
         
@@ -617,18 +541,17 @@ def approve_leave_for_employee(
         
         # Step 8: Send Leave Email
         print("[HRMS Admin] Step 8/9: SendLeaveEmail...", flush=True)
-        resp8 = httpx.post(
+        resp8 = hrms_client().post(
             f"{HRMS_BASE_URL}/api/hrms/leave/LeaveRequest/SendLeaveEmail",
             json=approval_result,  # Use response from Step 7
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 8 complete (Status: {resp8.status_code})", flush=True)
         
         # Step 9: Get Employee Leave Requests (Final Check)
         print("[HRMS Admin] Step 9/9: GetEmployeeLeaveRequests (final verification)...", flush=True)
-        resp9 = httpx.get(
+        resp9 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/LeaveRequest/GetEmployeeLeaveRequests",
             params={
                 "month": 0,
@@ -643,8 +566,7 @@ def approve_leave_for_employee(
                 "pageSize": 15
             },
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 9 complete (Status: {resp9.status_code})", flush=True)
         
@@ -5,83 +5,35 @@
 through 5 HRMS API endpoints.
 """
 
-from typing import Annotated, Optional, Dict, Any, List
+from typing import Annotated, Optional, Dict, Any, List, Iterable, Iterator
 from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
 import httpx
-import urllib3
+import ijson
 import json
 from app.workflows.tools import tool_registry
+from app.workflows.tools._hrms_http import HRMS_BASE_URL, hrms_client, get_token
 from app.workflows.prompt_loader import should_require_approval
 from langgraph.types import interrupt
 
-# Suppress SSL warnings for self-signed certificates
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# Page size for GetEmployeeLeaveRequests; large enough that one request covers an employee's history
+LEAVE_REQUESTS_PAGE_SIZE = 200
 
-# HRMS API Configuration - Admin credentials for API authentication
-HRMS_BASE_URL = "https://abcl.myrecombd.com:9999"
-HRMS_USERNAME = "demo_admin"
-HRMS_PASSWORD = "Demo@2024"
+# Re-fetch the employee's leave requests after cancelling (debugging aid, off by default)
+VERIFY_AFTER_CANCEL = os.getenv("HRMS_VERIFY_AFTER_CANCEL", "").lower() in ("1", "true", "yes")
 
+# Background workers for follow-up calls whose result the user doesn't wait on (e.g. emails)
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hrms-leave-cancel")
 
-def _encrypt_value(value: str) -> Optional[str]:
-    """Encrypt a value using the HRMS encrypt endpoint."""
-    try:
-        response = httpx.post(
-            f"{HRMS_BASE_URL}/encrypt",
-            json=value,
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
-            verify=False
-        )
-        
-        if response.status_code == 200:
-            return response.text.strip().strip('"')
-        else:
-            print(f"[HRMS Admin] Encrypt failed: HTTP {response.status_code}", flush=True)
-            return None
-    except Exception as e:
-        print(f"[HRMS Admin] Encrypt error: {str(e)}", flush=True)
-        return None
 
-
-def _get_hrms_token() -> Optional[str]:
-    """Authenticate with HRMS and get bearer token."""
-    print("[HRMS Admin] Authenticating...", flush=True)
-    
-    # Encrypt credentials
-    encrypted_username = _encrypt_value(HRMS_USERNAME)
-    encrypted_password = _encrypt_value(HRMS_PASSWORD)
-    
-    if not encrypted_username or not encrypted_password:
-        print("[HRMS Admin] Failed to encrypt credentials", flush=True)
-        return None
-    
-    # Login
+def _log_email_result(future: Future) -> None:
+    """Log the outcome of a background cancellation email request."""
     try:
-        login_response = httpx.post(
-            f"{HRMS_BASE_URL}/api/ControlPanel/Access/login",
-            json={
-                "username": encrypted_username,
-                "password": encrypted_password
-            },
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
-            verify=False
-        )
-        
-        if login_response.status_code == 200:
-            data = login_response.json()
-            token = data.get("token") or data.get("access_token") or data.get("accessToken")
-            if token:
-                print("[HRMS Admin] Authentication successful", flush=True)
-                return token
-            
-        print(f"[HRMS Admin] Login failed: {login_response.status_code}", flush=True)
-        return None
-            
+        response = future.result()
+        print(f"[HRMS Admin] ✓ Step 4 complete (Status: {response.status_code})", flush=True)
     except Exception as e:
-        print(f"[HRMS Admin] Login error: {str(e)}", flush=True)
-        return None
+        print(f"[HRMS Admin] ⚠️ Step 4 cancellation email failed: {str(e)}", flush=True)
 
 
 def _format_datetime(date_str: str) -> str:
@@ -128,9 +80,62 @@ def _extract_date_from_datetime(datetime_str: str) -> str:
     return datetime_str[:10] if len(datetime_str) >= 10 else datetime_str
 
 
+# JSON paths that may hold the employee array in the GetEmployeeServiceData payload
+_ROSTER_PREFIXES = frozenset({"item", "data.item", "employees.item", "result.item", "items.item"})
+
+# Candidate field names seen across HRMS payload versions, in preference order
+_NAME_KEYS = ("employeeName", "name", "fullName", "employee_name", "EmployeeName", "Name")
+_EMPLOYEE_ID_KEYS = ("employeeId", "id", "EmployeeId")
+_FROM_DATE_KEYS = ("appliedFromDate", "AppliedFromDate", "applied_from_date")
+_TO_DATE_KEYS = ("appliedToDate", "AppliedToDate", "applied_to_date")
+_LEAVE_REQUEST_ID_KEYS = ("employeeLeaveRequestId", "EmployeeLeaveRequestId")
+
+# Most matches listed in the "multiple employees" error; scanning stops once exceeded
+_MAX_REPORTED_MATCHES = 5
+
+
+def _detect_key(record: Dict[str, Any], candidates: Iterable[str]) -> Optional[str]:
+    """Return the first candidate key populated in record, or None."""
+    return next((k for k in candidates if record.get(k)), None)
+
+
+def _iter_roster(byte_chunks: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    """Incrementally yield employee records from a streamed roster payload.
+    
+    Only one employee object is materialized at a time, so peak memory stays
+    constant regardless of roster size.
+    """
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events)
+    builder = None
+    item_prefix = None
+    
+    for chunk in byte_chunks:
+        parser.send(chunk)
+        for prefix, event, value in events:
+            if builder is None:
+                if event == "start_map" and prefix in _ROSTER_PREFIXES:
+                    builder = ijson.ObjectBuilder()
+                    item_prefix = prefix
+                    builder.event(event, value)
+                continue
+            
+            if event == "end_map" and prefix == item_prefix:
+                yield builder.value
+                builder = None
+            else:
+                builder.event(event, value)
+        del events[:]
+    
+    parser.close()
+
+
 def _search_employee_by_name(token: str, employee_name: str) -> Optional[Dict]:
     """Search for employee by name and return employeeId and employeeName.
     
+    The roster is streamed and filtered record by record; scanning stops as soon
+    as more matches are found than the error message would report.
+    
     Returns:
         Dict with 'employeeId' and 'employeeName' if found,
         Dict with 'error' key if multiple matches,
@@ -139,55 +144,48 @@ def _search_employee_by_name(token: str, employee_name: str) -> Optional[Dict]:
     print(f"[HRMS Admin] Searching for employee: {employee_name}", flush=True)
     
     try:
-        response = httpx.get(
+        with hrms_client().stream(
+            "GET",
             f"{HRMS_BASE_URL}/api/HRMS/Employee/Info/GetEmployeeServiceData",
             headers={"Authorization": f"Bearer {token}"},
-            timeout=30.0,
-            verify=False
-        )
-        
-        if response.status_code != 200:
-            print(f"[HRMS Admin] GetEmployeeServiceData failed: HTTP {response.status_code}", flush=True)
-            return None
-        
-        data = response.json()
-        name_lower = employee_name.lower().strip()
-        matches = []
-        
-        # Handle different response structures
-        employees = []
-        if isinstance(data, list):
-            employees = data
-        elif isinstance(data, dict):
-            # Try common keys for employee arrays
-            employees = (data.get("data") or data.get("employees") or 
-                        data.get("result") or data.get("items") or [])
-            # If still empty, check if the dict itself contains employee fields
-            if not employees and ("employeeId" in data or "id" in data):
-                employees = [data]
-        
-        print(f"[HRMS Admin] Found {len(employees)} total employees in response", flush=True)
-        
-        # Search through employees
-        for emp in employees:
-            if not isinstance(emp, dict):
-                continue
-                
-            # Try multiple possible name fields
-            emp_name = (emp.get("employeeName") or emp.get("name") or 
-                       emp.get("fullName") or emp.get("employee_name") or
-                       emp.get("EmployeeName") or emp.get("Name") or "")
+            timeout=30.0
+        ) as response:
+            if response.status_code != 200:
+                print(f"[HRMS Admin] GetEmployeeServiceData failed: HTTP {response.status_code}", flush=True)
+                return None
             
-            if not emp_name:
-                continue
+            name_lower = employee_name.lower().strip()
+            matches = []
+            scanned = 0
+            name_key = id_key = None
+            
+            # Search through employees as they arrive
+            for emp in _iter_roster(response.iter_bytes()):
+                scanned += 1
+                
+                # Detect which name/ID fields this payload uses on the first populated record
+                if name_key is None:
+                    name_key = _detect_key(emp, _NAME_KEYS)
+                    if name_key is None:
+                        continue
+                if id_key is None:
+                    id_key = _detect_key(emp, _EMPLOYEE_ID_KEYS)
                 
-            emp_name_lower = emp_name.lower()
-            # Case-insensitive partial matching
-            if name_lower in emp_name_lower or emp_name_lower in name_lower:
-                matches.append({
-                    "employeeId": emp.get("employeeId") or emp.get("id") or emp.get("EmployeeId"),
-                    "employeeName": emp_name
-                })
+                emp_name = emp.get(name_key) or ""
+                if not emp_name:
+                    continue
+                    
+                emp_name_lower = emp_name.lower()
+                # Case-insensitive partial matching
+                if name_lower in emp_name_lower or emp_name_lower in name_lower:
+                    matches.append({
+                        "employeeId": emp.get(id_key) if id_key else None,
+                        "employeeName": emp_name
+                    })
+                    if len(matches) > _MAX_REPORTED_MATCHES:
+                        break
+        
+        print(f"[HRMS Admin] Scanned {scanned} employee(s) in response", flush=True)
         
         if len(matches) == 0:
             print(f"[HRMS Admin] No employee found matching '{employee_name}'", flush=True)
@@ -197,7 +195,7 @@ def _search_employee_by_name(token: str, employee_name: str) -> Optional[Dict]:
             match_names = [m["employeeName"] for m in matches]
             print(f"[HRMS Admin] Multiple matches found: {match_names}", flush=True)
             return {
-                "error": f"Multiple employees found matching '{employee_name}'. Please provide a more specific name. Matches: {', '.join(match_names[:5])}"
+                "error": f"Multiple employees found matching '{employee_name}'. Please provide a more specific name. Matches: {', '.join(match_names[:_MAX_REPORTED_MATCHES])}"
             }
         
         result = matches[0]
@@ -231,6 +229,7 @@ def _find_leave_request_by_date(leave_requests: List[Dict], applied_date: str) -
     
     matches = []
     checked_requests = []
+    from_key = to_key = request_id_key = None
     
     print(f"[HRMS Admin] Checking {len(leave_requests)} leave request(s) for date match...", flush=True)
     
@@ -239,13 +238,14 @@ def _find_leave_request_by_date(leave_requests: List[Dict], applied_date: str) -
             print(f"[HRMS Admin] Request {idx+1} is not a dict, skipping", flush=True)
             continue
         
-        # Extract dates from various possible field names
-        from_date_str = (leave_req.get("appliedFromDate") or 
-                        leave_req.get("AppliedFromDate") or 
-                        leave_req.get("applied_from_date") or "")
-        to_date_str = (leave_req.get("appliedToDate") or 
-                      leave_req.get("AppliedToDate") or 
-                      leave_req.get("applied_to_date") or "")
+        # Detect which date/ID fields this payload uses on the first populated request
+        if from_key is None or to_key is None:
+            from_key = _detect_key(leave_req, _FROM_DATE_KEYS)
+            to_key = _detect_key(leave_req, _TO_DATE_KEYS)
+            request_id_key = _detect_key(leave_req, _LEAVE_REQUEST_ID_KEYS) or _LEAVE_REQUEST_ID_KEYS[0]
+        
+        from_date_str = leave_req.get(from_key, "") if from_key else ""
+        to_date_str = leave_req.get(to_key, "") if to_key else ""
         
         if not from_date_str or not to_date_str:
             print(f"[HRMS Admin] Request {idx+1} missing date fields (from: {bool(from_date_str)}, to: {bool(to_date_str)})", flush=True)
@@ -267,7 +267,7 @@ def _find_leave_request_by_date(leave_requests: List[Dict], applied_date: str) -
             
             # Check if applied_date falls within the leave period
             if from_dt <= applied_dt <= to_dt:
-                request_id = leave_req.get("employeeLeaveRequestId") or leave_req.get("EmployeeLeaveRequestId")
+                request_id = leave_req.get(request_id_key)
                 print(f"[HRMS Admin] ✓ Match found! Request {idx+1} (ID: {request_id}) covers date {applied_date}", flush=True)
                 matches.append(leave_req)
         except ValueError as e:
@@ -282,15 +282,14 @@ def _find_leave_request_by_date(leave_requests: List[Dict], applied_date: str) -
         return None
     
     if len(matches) > 1:
-        match_ids = [str(m.get("employeeLeaveRequestId") or m.get("EmployeeLeaveRequestId") or "unknown") 
-                    for m in matches]
+        match_ids = [str(m.get(request_id_key) or "unknown") for m in matches]
         print(f"[HRMS Admin] Multiple leave requests found matching date {applied_date}: {match_ids}", flush=True)
         return {
             "error": f"Multiple leave requests found for date {applied_date}. Please provide more specific information. Request IDs: {', '.join(match_ids[:5])}"
         }
     
     matched = matches[0]
-    request_id = matched.get("employeeLeaveRequestId") or matched.get("EmployeeLeaveRequestId")
+    request_id = matched.get(request_id_key)
     print(f"[HRMS Admin] ✓ Found leave request: ID {request_id}", flush=True)
     return matched
 
@@ -324,7 +323,7 @@ def cancel_leave_for_employee(
     print("-" * 70, flush=True)
     
     # Authenticate
-    token = _get_hrms_token()
+    token = get_token()
     if not token:
         return "❌ Failed to authenticate with HRMS system."
     
@@ -345,18 +344,18 @@ def cancel_leave_for_employee(
     print(f"[HRMS Admin] Using Employee ID: {employee_id}", flush=True)
     print("-" * 70, flush=True)
     
-    # Format applied_date
+    # Format applied_date; strptime rejects the compact and ISO week forms
+    # that date.fromisoformat accepts, and strftime zero-pads "2026-1-5"
     formatted_date = _format_datetime(applied_date)
     try:
-        applied_dt = datetime.strptime(formatted_date, "%Y-%m-%d")
-        formatted_date = applied_dt.strftime("%Y-%m-%d")
+        formatted_date = datetime.strptime(formatted_date, "%Y-%m-%d").strftime("%Y-%m-%d")
     except ValueError:
         return f"❌ Invalid date format: {applied_date}. Please use YYYY-MM-DD format."
     
     # Step 2: Get Employee Leave Requests
     print("[HRMS Admin] Step 2/5: GetEmployeeLeaveRequests (finding matching leave request)...", flush=True)
     try:
-        resp2 = httpx.get(
+        resp2 = hrms_client().get(
             f"{HRMS_BASE_URL}/api/HRMS/Leave/LeaveRequest/GetEmployeeLeaveRequests",
             params={
                 "month": 0,
@@ -368,11 +367,10 @@ def cancel_leave_for_employee(
                 "appliedToDate": "",
                 "stateStatus": "",
                 "pageNumber": 1,
-                "pageSize": 15
+                "pageSize": LEAVE_REQUESTS_PAGE_SIZE
             },
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 2 complete (Status: {resp2.status_code})", flush=True)
         
@@ -494,7 +492,7 @@ def cancel_leave_for_employee(
     try:
         # Step 3: Delete Leave Request
         print("[HRMS Admin] Step 3/5: DeleteEmployeeLeaveRequest (cancelling leave request)...", flush=True)
-        resp3 = httpx.post(
+        resp3 = hrms_client().post(
             f"{HRMS_BASE_URL}/api/hrms/leave/LeaveRequest/DeleteEmployeeLeaveRequest",
             json={
                 "employeeId": employee_id,
@@ -502,8 +500,7 @@ def cancel_leave_for_employee(
                 "leaveTypeId": leave_type_id
             },
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
         print(f"[HRMS Admin] ✓ Step 3 complete (Status: {resp3.status_code})", flush=True)
         
@@ -523,8 +520,10 @@ def cancel_leave_for_employee(
         print(f"[HRMS Admin] ✓ Leave request cancelled successfully", flush=True)
         
         # Step 4: Send Cancellation Email
-        print("[HRMS Admin] Step 4/5: LeaveRequestEmailSend (sending cancellation email)...", flush=True)
-        resp4 = httpx.get(
+        # The cancellation is already committed, so the email is sent in the background
+        print("[HRMS Admin] Step 4/5: LeaveRequestEmailSend (dispatching cancellation email)...", flush=True)
+        email_future = _EXECUTOR.submit(
+            hrms_client().get,
             f"{HRMS_BASE_URL}/api/hrms/leave/LeaveRequest/LeaveRequestEmailSend",
             params={
                 "employeeId": employee_id,
@@ -533,32 +532,32 @@ def cancel_leave_for_employee(
                 "leaveRequestId": employee_leave_request_id
             },
             headers=headers,
-            timeout=30.0,
-            verify=False
+            timeout=30.0
         )
-        print(f"[HRMS Admin] ✓ Step 4 complete (Status: {resp4.status_code})", flush=True)
+        email_future.add_done_callback(_log_email_result)
         
         # Step 5: Get Employee Leave Requests (Final Verification)
-        print("[HRMS Admin] Step 5/5: GetEmployeeLeaveRequests (final verification)...", flush=True)
-        resp5 = httpx.get(
-            f"{HRMS_BASE_URL}/api/hrms/leave/LeaveRequest/GetEmployeeLeaveRequests",
-            params={
-                "month": 0,
-                "year": 0,
-                "employeeId": employee_id,
-                "leaveTypeId": 0,
-                "dayLeaveType": "",
-                "appliedFromDate": "",
-                "appliedToDate": "",
-                "stateStatus": "",
-                "pageNumber": 1,
-                "pageSize": 15
-            },
-            headers=headers,
-            timeout=30.0,
-            verify=False
-        )
-        print(f"[HRMS Admin] ✓ Step 5 complete (Status: {resp5.status_code})", flush=True)
+        # The response is only logged, so skip the round trip unless explicitly enabled
+        if VERIFY_AFTER_CANCEL:
+            print("[HRMS Admin] Step 5/5: GetEmployeeLeaveRequests (final verification)...", flush=True)
+            resp5 = hrms_client().get(
+                f"{HRMS_BASE_URL}/api/hrms/leave/LeaveRequest/GetEmployeeLeaveRequests",
+                params={
+                    "month": 0,
+                    "year": 0,
+                    "employeeId": employee_id,
+                    "leaveTypeId": 0,
+                    "dayLeaveType": "",
+                    "appliedFromDate": "",
+                    "appliedToDate": "",
+                    "stateStatus": "",
+                    "pageNumber": 1,
+                    "pageSize": LEAVE_REQUESTS_PAGE_SIZE
+                },
+                headers=headers,
+                timeout=30.0
+            )
+            print(f"[HRMS Admin] ✓ Step 5 complete (Status: {resp5.status_code})", flush=True)
         
         print("="*70, flush=True)
         print("[HRMS Admin] ✅ LEAVE CANCELLATION PROCESS COMPLETED", flush=True)
@@ -7,6 +7,6 @@
 """
 
 from mcp_server.adapter import get_mcp_tools
-from mcp_server.client import get_mcp_client
+from mcp_server.client import get_mcp_client, reset_mcp_client
 
-__all__ = ["get_mcp_tools", "get_mcp_client"]
+__all__ = ["get_mcp_tools", "get_mcp_client", "reset_mcp_client"]
@@ -2,33 +2,189 @@
 
 This module provides helper functions to get MCP tools (which are automatically
 converted to LangChain BaseTool instances by langchain-mcp-adapters).
+
+Discovered tool definitions are cached in memory and in a small on-disk
+catalog keyed on a hash of the MCP client configuration, so neither repeated
+calls nor process restarts have to list tools from every server again.
+Workers that must start fast can call ``get_mcp_tools(cache_only=True)`` to
+serve only what is cached, and a refresh job can call
+``get_mcp_tools(force_rebuild=True)``.
 """
 
-from typing import List, Optional
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 from langchain_core.tools import BaseTool
-from mcp_server.client import get_mcp_client
+from mcp.types import Tool
+from mcp_server.client import PooledMCPClient, get_mcp_client, get_mcp_config_hash
 from app.core.config import settings
 
+# On-disk tool catalog shared across process restarts
+TOOL_CATALOG_PATH = Path(
+    os.getenv("HRMS_MCP_CACHE_DIR", str(Path.home() / ".cache" / "hrms-mcp"))
+) / "tools.json"
+
+# Seconds a discovered tool catalog stays valid
+TOOL_CATALOG_TTL = 3600
+
+# In-memory tool list, the config hash it was built for, and when it was discovered
+_tools_cache: Optional[List[BaseTool]] = None
+_tools_cache_key: Optional[str] = None
+_tools_cache_saved_at: float = 0.0
+
+
+def reset_tools_cache() -> None:
+    """Forget the in-memory tool list (called by reset_mcp_client).
+
+    Those tools are bound to the client being dropped. The on-disk catalog
+    only holds definitions, so it stays and is rebound to the new client.
+    """
+    global _tools_cache, _tools_cache_key, _tools_cache_saved_at
+    _tools_cache = None
+    _tools_cache_key = None
+    _tools_cache_saved_at = 0.0
+
+
+def _cache_key() -> str:
+    """Key tool caches on the client configuration hash and the app version."""
+    return f"{settings.APP_VERSION}:{get_mcp_config_hash()}"
+
+
+def _is_fresh(saved_at: float) -> bool:
+    return time.time() - saved_at < TOOL_CATALOG_TTL
+
+
+def _load_catalog(key: str) -> Optional[Dict[str, Any]]:
+    """Return the persisted catalog if it matches key and hasn't expired."""
+    try:
+        with open(TOOL_CATALOG_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(data, dict) or data.get("key") != key:
+        return None
+    if not _is_fresh(data.get("saved_at", 0.0)):
+        return None
+    return data
+
+
+def _save_catalog(key: str, catalog: Dict[str, List[Dict[str, Any]]], saved_at: float) -> None:
+    """Persist tool definitions per server; failures only cost a cold start."""
+    try:
+        TOOL_CATALOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = TOOL_CATALOG_PATH.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps({"key": key, "saved_at": saved_at, "servers": catalog}),
+            encoding="utf-8"
+        )
+        os.replace(tmp_path, TOOL_CATALOG_PATH)
+    except OSError as e:
+        print(f"[MCP] Could not write tool catalog: {str(e)}", flush=True)
+
+
+async def _list_server_tools(client: PooledMCPClient, server_name: str) -> List[Dict[str, Any]]:
+    """List the MCP tool definitions exposed by one server as plain dicts."""
+    return [
+        tool.model_dump(mode="json", by_alias=True, exclude_none=True)
+        for tool in await client.list_tools(server_name)
+    ]
 
-async def get_mcp_tools() -> List[BaseTool]:
+
+async def _discover_catalog(client: PooledMCPClient) -> Tuple[Dict[str, List[Dict[str, Any]]], bool]:
+    """List tools from every configured server concurrently.
+
+    A failing server is logged and skipped so its siblings' tools are kept.
+
+    Returns:
+        (catalog, complete) where complete is False if any server failed
+    """
+    server_names = list(client.connections)
+    results = await asyncio.gather(
+        *(_list_server_tools(client, server_name) for server_name in server_names),
+        return_exceptions=True
+    )
+
+    catalog: Dict[str, List[Dict[str, Any]]] = {}
+    complete = True
+    for server_name, result in zip(server_names, results, strict=True):
+        if isinstance(result, BaseException):
+            print(f"[MCP] Error listing tools from '{server_name}': {str(result)}", flush=True)
+            complete = False
+            continue
+        catalog[server_name] = result
+    return catalog, complete
+
+
+def _build_tools(
+    client: PooledMCPClient,
+    catalog: Dict[str, List[Dict[str, Any]]]
+) -> List[BaseTool]:
+    """Turn cached tool definitions into LangChain tools bound to their server."""
+    tools: List[BaseTool] = []
+    for server_name, definitions in catalog.items():
+        if server_name not in client.connections:
+            continue
+        for definition in definitions:
+            tools.append(client.bind_tool(server_name, Tool.model_validate(definition)))
+    return tools
+
+
+async def get_mcp_tools(cache_only: bool = False, force_rebuild: bool = False) -> List[BaseTool]:
     """Get all MCP tools as LangChain BaseTool instances.
-    
+
     This function:
-    1. Initializes MultiServerMCPClient with local and external MCP servers
-    2. Fetches tools from all configured MCP servers
+    1. Returns the in-memory tool list if the MCP configuration is unchanged
+       and the list is younger than TOOL_CATALOG_TTL
+    2. Otherwise rebuilds it from the on-disk catalog, or lists tools from
+       every configured MCP server and refreshes the catalog
     3. Returns LangChain BaseTool instances ready for LangGraph
-    
+
+    Tools rebuilt from the catalog only carry their schemas; no MCP server is
+    contacted until a tool is actually called.
+
+    Args:
+        cache_only: Never contact the MCP servers; return [] on a cache miss
+        force_rebuild: Ignore both caches and rediscover tools from the servers
+
     Returns:
         List of LangChain BaseTool instances from all MCP servers
     """
+    global _tools_cache, _tools_cache_key, _tools_cache_saved_at
+
     # Check if MCP is enabled
     if not getattr(settings, 'MCP_SERVER_ENABLED', True):
         return []
-    
+
     try:
+        key = _cache_key()
+        if (not force_rebuild and _tools_cache is not None
+                and _tools_cache_key == key and _is_fresh(_tools_cache_saved_at)):
+            return list(_tools_cache)
+
+        data = None if force_rebuild else _load_catalog(key)
+        if data is None and cache_only:
+            return []
+
         client = await get_mcp_client()
-        tools = await client.get_tools()
-        return tools
+        if data is not None:
+            catalog = data["servers"]
+            saved_at = data["saved_at"]
+        else:
+            catalog, complete = await _discover_catalog(client)
+            if not complete:
+                # Serve what we have, but retry the failed servers on the next call
+                return _build_tools(client, catalog)
+            saved_at = time.time()
+            _save_catalog(key, catalog, saved_at)
+
+        _tools_cache = _build_tools(client, catalog)
+        _tools_cache_key = key
+        _tools_cache_saved_at = saved_at
+        return list(_tools_cache)
     except Exception as e:
         print(f"[MCP] Error getting MCP tools: {str(e)}", flush=True)
         return []
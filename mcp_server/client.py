@@ -2,40 +2,125 @@
 
 This module provides functionality to connect to and consume tools from
 external MCP servers using MultiServerMCPClient from langchain-mcp-adapters.
+STDIO servers are kept running in an MCPServerPool instead of being spawned
+per tool call.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from langchain_core.tools import BaseTool
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from mcp.types import Tool
+from mcp_server.pool import MCPServerPool, PooledSession, register_atexit
 from app.core.config import settings
+from pathlib import Path
+import asyncio
+import functools
+import hashlib
+import json
 import os
 
 
-def get_mcp_client_config() -> Dict[str, Dict[str, Any]]:
-    """Get MCP client configuration from settings.
+class PooledMCPClient:
+    """MultiServerMCPClient front-end that keeps STDIO servers running.
     
-    Returns:
-        Dictionary mapping server names to their configuration
+    Tools from STDIO servers are bound to a persistent pooled session; tools
+    from HTTP/SSE servers keep MultiServerMCPClient's per-call sessions.
+    """
+    
+    def __init__(self, connections: Dict[str, Dict[str, Any]]):
+        self.connections = connections
+        self._client = MultiServerMCPClient(connections)
+        self._pool = MCPServerPool({
+            name: connection for name, connection in connections.items()
+            if connection.get("transport") == "stdio"
+        })
+        register_atexit(self._pool)
+    
+    def session(self, server_name: str):
+        """Open a one-off session to a server (see MultiServerMCPClient.session)."""
+        return self._client.session(server_name)
+    
+    async def list_tools(self, server_name: str) -> List[Tool]:
+        """List the raw MCP tool definitions exposed by one server."""
+        if server_name in self._pool:
+            return await self._pool.list_tools(server_name)
+        
+        tools: List[Tool] = []
+        async with self._client.session(server_name) as session:
+            cursor = None
+            while True:
+                page = await session.list_tools(cursor=cursor)
+                tools.extend(page.tools)
+                cursor = page.nextCursor
+                if not cursor:
+                    return tools
+    
+    def bind_tool(self, server_name: str, tool: Tool) -> BaseTool:
+        """Convert an MCP tool definition into a LangChain tool for its server."""
+        if server_name in self._pool:
+            return convert_mcp_tool_to_langchain_tool(PooledSession(self._pool, server_name), tool)
+        return convert_mcp_tool_to_langchain_tool(None, tool, connection=self.connections[server_name])
+    
+    async def get_tools(self, *, server_name: Optional[str] = None) -> List[BaseTool]:
+        """Get LangChain tools from one server, or from all configured servers.
+        
+        A failing server is logged and skipped so its siblings' tools are kept.
+        """
+        server_names = [server_name] if server_name else list(self.connections)
+        results = await asyncio.gather(
+            *(self.list_tools(name) for name in server_names),
+            return_exceptions=True
+        )
+        tools: List[BaseTool] = []
+        for name, result in zip(server_names, results, strict=True):
+            if isinstance(result, BaseException):
+                print(f"[MCP] Error listing tools from '{name}': {str(result)}", flush=True)
+                continue
+            tools.extend(self.bind_tool(name, tool) for tool in result)
+        return tools
+    
+    async def aclose(self) -> None:
+        """Stop the pooled STDIO server processes."""
+        await self._pool.aclose()
+    
+    def close(self) -> None:
+        """Best-effort synchronous variant of aclose()."""
+        self._pool.close()
+
+
+# Process-wide client, created on first use (see get_mcp_client)
+_client: Optional[PooledMCPClient] = None
+_client_lock = asyncio.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _build_config() -> Dict[str, Dict[str, Any]]:
+    """Build the MCP client configuration from settings (cached per process).
+    
+    Settings and the server file don't change at runtime, so the settings
+    lookups and the server.py existence check run once. Call
+    reset_mcp_client() after changing the MCP settings.
     """
     config: Dict[str, Dict[str, Any]] = {}
     
     # Add local HRMS MCP server
     if getattr(settings, 'MCP_SERVER_ENABLED', True):
-        mcp_transport = getattr(settings, 'MCP_SERVER_TRANSPORT', 'stdio')
-        mcp_url = getattr(settings, 'MCP_SERVER_URL', 'http://localhost:8001/mcp')
+        mcp_transport = getattr(settings, 'MCP_SERVER_TRANSPORT', 'http')
+        mcp_url = getattr(settings, 'MCP_SERVER_URL', 'http://127.0.0.1:8001/mcp')
         
         if mcp_transport == "http":
-            # HTTP transport for external access
+            # HTTP transport (default): long-running server, see mcp_server/sidecar.py
             config["hrms"] = {
-                "transport": "http",
+                "transport": "streamable_http",
                 "url": mcp_url
             }
         else:
-            # STDIO transport (default, for subprocess use)
+            # STDIO transport (subprocess kept alive by MCPServerPool)
             server_command = getattr(settings, 'MCP_SERVER_COMMAND', 'python')
             server_args = getattr(settings, 'MCP_SERVER_ARGS', ['-m', 'mcp_server.server'])
             
             # Get absolute path to server.py
-            from pathlib import Path
             project_root = Path(__file__).parent.parent
             server_path = project_root / "mcp_server" / "server.py"
             
@@ -46,6 +131,16 @@ def get_mcp_client_config() -> Dict[str, Dict[str, Any]]:
             }
     
     # Add external MCP servers from configuration
+    config.update(_build_external_config())
+    
+    return config
+
+
+@functools.cache
+def _build_external_config() -> Dict[str, Dict[str, Any]]:
+    """Build the entries for MCP_EXTERNAL_SERVERS once per process."""
+    config: Dict[str, Dict[str, Any]] = {}
+    
     external_servers = getattr(settings, 'MCP_EXTERNAL_SERVERS', [])
     if isinstance(external_servers, list):
         for idx, server_config in enumerate(external_servers):
@@ -59,11 +154,55 @@ def get_mcp_client_config() -> Dict[str, Dict[str, Any]]:
     return config
 
 
-async def get_mcp_client() -> MultiServerMCPClient:
-    """Create and return a MultiServerMCPClient instance.
+def get_mcp_client_config() -> Dict[str, Dict[str, Any]]:
+    """Get MCP client configuration from settings.
     
     Returns:
-        MultiServerMCPClient configured with local and external MCP servers
+        Dictionary mapping server names to their configuration. This is the
+        cached object shared by every caller: treat it as read-only and copy
+        it before making changes.
+    """
+    return _build_config()
+
+
+@functools.lru_cache(maxsize=1)
+def get_mcp_config_hash() -> str:
+    """Return a stable sha256 of the MCP client configuration.
+    
+    Used as a cache key for anything derived from the configuration (e.g. the
+    discovered tool catalog); it changes only after reset_mcp_client().
     """
-    config = get_mcp_client_config()
-    return MultiServerMCPClient(config)
+    payload = json.dumps(_build_config(), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def get_mcp_client() -> PooledMCPClient:
+    """Return the shared MCP client instance.
+    
+    The client is built once per process from get_mcp_client_config();
+    call reset_mcp_client() after changing the MCP settings.
+    
+    Returns:
+        PooledMCPClient configured with local and external MCP servers
+    """
+    global _client
+    if _client is None:
+        async with _client_lock:
+            if _client is None:
+                _client = PooledMCPClient(get_mcp_client_config())
+    return _client
+
+
+def reset_mcp_client() -> None:
+    """Drop the shared client, cached config and tools so all are rebuilt from settings."""
+    global _client
+    # Imported here: the adapter imports this module
+    from mcp_server.adapter import reset_tools_cache
+    
+    _build_config.cache_clear()
+    _build_external_config.cache_clear()
+    get_mcp_config_hash.cache_clear()
+    if _client is not None:
+        _client.close()
+    _client = None
+    reset_tools_cache()
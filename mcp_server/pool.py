@@ -0,0 +1,201 @@
+"""Persistent STDIO session pool for MCP servers.
+
+MultiServerMCPClient opens a new session for every tool call, which for STDIO
+servers means spawning a fresh Python process each time. MCPServerPool instead
+starts each STDIO server once and keeps its stdin/stdout pipes open for the
+life of the process:
+
+- one long-lived ClientSession per server name
+- calls to different servers run concurrently
+- calls to the same server are serialized by a per-server lock
+- a server whose process died is restarted on the next call
+
+Usage:
+    pool = MCPServerPool({"hrms": {"transport": "stdio", "command": "python", "args": [...]}})
+    result = await pool.call_tool("hrms", "hrms_leave_balance_tool", {})
+    await pool.aclose()
+"""
+
+import asyncio
+import atexit
+from typing import Any, Dict, List, Optional
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CallToolResult, Tool
+
+
+class MCPServerPool:
+    """Keeps one live STDIO session per configured MCP server."""
+
+    def __init__(self, connections: Dict[str, Dict[str, Any]]):
+        self._connections = connections
+        self._sessions: Dict[str, ClientSession] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._stops: Dict[str, asyncio.Event] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __contains__(self, server_name: str) -> bool:
+        return server_name in self._connections
+
+    def _check_loop(self) -> None:
+        """Forget sessions owned by an event loop that is no longer running."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._sessions.clear()
+            self._tasks.clear()
+            self._stops.clear()
+            self._locks.clear()
+            self._loop = loop
+
+    def _lock(self, server_name: str) -> asyncio.Lock:
+        lock = self._locks.get(server_name)
+        if lock is None:
+            lock = self._locks[server_name] = asyncio.Lock()
+        return lock
+
+    async def _serve(
+        self,
+        server_name: str,
+        params: StdioServerParameters,
+        ready: asyncio.Future,
+        stop: asyncio.Event
+    ) -> None:
+        """Own one server process and its session until asked to stop.
+
+        The stdio/session context managers must be entered and exited by the
+        same task, so each server gets a dedicated background task.
+        """
+        try:
+            async with stdio_client(params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self._sessions[server_name] = session
+                    ready.set_result(session)
+                    await stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                print(f"[MCP Pool] Server '{server_name}' exited: {str(e)}", flush=True)
+        finally:
+            if self._stops.get(server_name) is stop:
+                self._sessions.pop(server_name, None)
+
+    async def _session(self, server_name: str) -> ClientSession:
+        """Return the live session for a server, starting it if needed.
+
+        Callers must hold the server's lock.
+        """
+        session = self._sessions.get(server_name)
+        task = self._tasks.get(server_name)
+        if session is not None and task is not None and not task.done():
+            return session
+
+        connection = self._connections[server_name]
+        params = StdioServerParameters(
+            command=connection["command"],
+            args=connection.get("args", []),
+            env=connection.get("env"),
+            cwd=connection.get("cwd")
+        )
+        ready = asyncio.get_running_loop().create_future()
+        stop = asyncio.Event()
+        print(f"[MCP Pool] Starting STDIO server '{server_name}'", flush=True)
+        self._stops[server_name] = stop
+        self._tasks[server_name] = asyncio.create_task(
+            self._serve(server_name, params, ready, stop),
+            name=f"mcp-pool-{server_name}"
+        )
+        return await ready
+
+    async def list_tools(self, server_name: str) -> List[Tool]:
+        """List every tool exposed by a server over its pooled session."""
+        self._check_loop()
+        async with self._lock(server_name):
+            session = await self._session(server_name)
+            tools: List[Tool] = []
+            cursor = None
+            while True:
+                page = await session.list_tools(cursor=cursor)
+                tools.extend(page.tools)
+                cursor = page.nextCursor
+                if not cursor:
+                    return tools
+
+    async def call_tool(
+        self,
+        server_name: str,
+        tool_name: str,
+        arguments: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> CallToolResult:
+        """Call a tool over the server's pooled session."""
+        self._check_loop()
+        async with self._lock(server_name):
+            session = await self._session(server_name)
+            try:
+                return await session.call_tool(tool_name, arguments, **kwargs)
+            except McpError:
+                raise
+            except Exception:
+                # Transport-level failure: drop the session so the next call restarts it
+                self._discard(server_name)
+                raise
+
+    def _discard(self, server_name: str) -> None:
+        """Stop a server's session task without waiting for it."""
+        stop = self._stops.pop(server_name, None)
+        if stop is not None:
+            stop.set()
+        self._tasks.pop(server_name, None)
+        self._sessions.pop(server_name, None)
+
+    async def aclose(self) -> None:
+        """Stop every server process owned by this pool."""
+        for stop in self._stops.values():
+            stop.set()
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._sessions.clear()
+        self._tasks.clear()
+        self._stops.clear()
+
+    def close(self) -> None:
+        """Best-effort synchronous shutdown, e.g. from atexit."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        if loop.is_running():
+            for stop in self._stops.values():
+                loop.call_soon_threadsafe(stop.set)
+            return
+        loop.run_until_complete(self.aclose())
+
+
+class PooledSession:
+    """Minimal ClientSession stand-in that routes tool calls through a pool.
+
+    langchain-mcp-adapters only calls ``call_tool`` on the session it is given,
+    so this lets the converted LangChain tools reuse the pooled process.
+    """
+
+    def __init__(self, pool: MCPServerPool, server_name: str):
+        self._pool = pool
+        self._server_name = server_name
+
+    async def call_tool(
+        self,
+        name: str,
+        arguments: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> CallToolResult:
+        return await self._pool.call_tool(self._server_name, name, arguments, **kwargs)
+
+
+def register_atexit(pool: MCPServerPool) -> None:
+    """Terminate the pool's server processes when the interpreter exits."""
+    atexit.register(pool.close)
@@ -3,30 +3,50 @@
 This server exposes HRMS tools as MCP tools using STDIO or HTTP transport.
 Run this as a standalone process:
   - STDIO: python -m mcp_server.server (or python -m mcp_server.server stdio)
-  - HTTP: python -m mcp_server.server http [port] (default port: 8001)
+  - HTTP: python -m mcp_server.server http [port] [host] (default: port 8001, host 0.0.0.0)
 
 IMPORTANT: In STDIO mode, stdout is reserved for JSONRPC messages.
-All print() statements from tools are redirected to stderr to prevent
-corrupting the MCP protocol.
+Text written to sys.stdout is sent to stderr once at startup to prevent
+tool output from corrupting the MCP protocol.
 """
 
-from typing import Optional
+from typing import Annotated, Any, get_args, get_origin
 import sys
+import threading
 import os
 from pathlib import Path
-from contextlib import redirect_stdout
-import io
+
+class _StdoutToStderr:
+    """sys.stdout replacement for STDIO mode.
+
+    Text writes go to stderr, but ``buffer`` stays the real stdout buffer:
+    the STDIO transport wraps ``sys.stdout.buffer`` when it starts and needs
+    the original pipe for JSONRPC.
+    """
+
+    def __init__(self, stdout):
+        self.buffer = stdout.buffer
+
+    def write(self, text):
+        return sys.stderr.write(text)
+
+    def flush(self):
+        sys.stderr.flush()
+
+    def __getattr__(self, name):
+        return getattr(sys.stderr, name)
+
 
 # Check if running in STDIO mode (default)
 _transport_arg = sys.argv[1] if len(sys.argv) > 1 else "stdio"
 _is_stdio_mode = _transport_arg != "http"
 
-# Save original stdout for MCP JSONRPC communication
-_original_stdout = sys.stdout
-
 if _is_stdio_mode:
     # Suppress some noisy logs
     os.environ.setdefault("HTTPX_LOG_LEVEL", "WARNING")
+    # Send all text written to sys.stdout (print(), logging handlers bound to
+    # stdout, ...) to stderr for the whole process
+    sys.stdout = _StdoutToStderr(sys.stdout)
 
 # Add project root to Python path so imports work when running as subprocess
 project_root = Path(__file__).parent.parent
@@ -50,184 +70,67 @@
 mcp = FastMCP("HRMS")
 
 
-def _run_with_stderr_redirect(func, *args, **kwargs):
-    """Run a function with stdout redirected to stderr.
+# HRMS functions exposed as MCP tools; each is registered as "<function name>_tool".
+# FastMCP builds the tool schema straight from their Annotated signatures and docstrings.
+HRMS_TOOLS = (
+    hrms_leave_apply,
+    hrms_leave_balance,
+    hrms_attendance_apply,
+    hrms_employee_info,
+    hrms_leave_apply_admin,
+    hrms_leave_approve_admin,
+    hrms_leave_cancel_admin,
+    hrms_attendance_approve_admin,
+    hrms_attendance_cancel_admin
+)
+
+
+def _strip_annotated(annotation: Any) -> Any:
+    """Return the bare type of an Annotated[...] hint."""
+    return get_args(annotation)[0] if get_origin(annotation) is Annotated else annotation
+
+
+# Register HRMS tools as MCP tools. FastMCP captures the parameter descriptions
+# into the tool schema at registration, after which the Annotated metadata is
+# only dead weight for per-call type-hint inspection and validation.
+for _tool_fn in HRMS_TOOLS:
+    mcp.tool(name=f"{_tool_fn.__name__}_tool")(_tool_fn)
+    _tool_fn.__annotations__ = {
+        name: _strip_annotated(annotation)
+        for name, annotation in _tool_fn.__annotations__.items()
+    }
+
+
+def _warm() -> None:
+    """Pay one-off first-call costs before the first tool request arrives.
     
-    This prevents print() statements from corrupting MCP JSONRPC in STDIO mode.
+    Loads the HITL prompt settings and logs in to HRMS, which opens the shared
+    keep-alive connection and caches the bearer token for every tool.
     """
-    if _is_stdio_mode:
-        # Capture stdout and redirect to stderr
-        captured = io.StringIO()
-        with redirect_stdout(captured):
-            result = func(*args, **kwargs)
-        # Print captured output to stderr
-        output = captured.getvalue()
-        if output:
-            print(output, file=sys.stderr, end='')
-        return result
-    else:
-        return func(*args, **kwargs)
-
-
-# Register HRMS tools as MCP tools
-@mcp.tool()
-def hrms_leave_apply_tool(
-    start_date: str,
-    total_days: int,
-    reason: str,
-    employee_id: Optional[int] = None,
-    leave_type_id: Optional[int] = None,
-    day_leave_type: Optional[str] = None,
-    half_day_type: Optional[str] = None
-) -> str:
-    """Apply for leave in the HRMS system."""
-    return _run_with_stderr_redirect(
-        hrms_leave_apply,
-        start_date=start_date,
-        total_days=total_days,
-        reason=reason,
-        employee_id=employee_id,
-        leave_type_id=leave_type_id,
-        day_leave_type=day_leave_type,
-        half_day_type=half_day_type
-    )
-
-
-@mcp.tool()
-def hrms_leave_balance_tool(
-    employee_id: Optional[int] = None
-) -> str:
-    """Get the current user's leave balance from the HRMS system."""
-    return _run_with_stderr_redirect(hrms_leave_balance, employee_id=employee_id)
-
-
-@mcp.tool()
-def hrms_attendance_apply_tool(
-    attendance_date: str,
-    reason: str,
-    in_time: Optional[str] = None,
-    out_time: Optional[str] = None,
-    time_request_for: Optional[str] = None,
-    employee_id: Optional[int] = None
-) -> str:
-    """Apply for manual attendance in the HRMS system."""
-    return _run_with_stderr_redirect(
-        hrms_attendance_apply,
-        attendance_date=attendance_date,
-        reason=reason,
-        in_time=in_time,
-        out_time=out_time,
-        time_request_for=time_request_for,
-        employee_id=employee_id
-    )
-
-
-@mcp.tool()
-def hrms_employee_info_tool(
-    employee_id: Optional[int] = None
-) -> str:
-    """Get the current user's employee personal information from the HRMS system."""
-    return _run_with_stderr_redirect(hrms_employee_info, employee_id=employee_id)
-
-
-@mcp.tool()
-def hrms_leave_apply_admin_tool(
-    employee_name: str,
-    start_date: str,
-    total_days: int,
-    reason: str,
-    leave_type_id: Optional[int] = None,
-    day_leave_type: Optional[str] = None,
-    half_day_type: Optional[str] = None
-) -> str:
-    """Apply leave for any employee under admin hierarchy. Search by name, validate hierarchy, and submit leave request."""
-    return _run_with_stderr_redirect(
-        hrms_leave_apply_admin,
-        employee_name=employee_name,
-        start_date=start_date,
-        total_days=total_days,
-        reason=reason,
-        leave_type_id=leave_type_id,
-        day_leave_type=day_leave_type,
-        half_day_type=half_day_type
-    )
-
-
-@mcp.tool()
-def hrms_leave_approve_admin_tool(
-    employee_name: str,
-    applied_date: str,
-    remarks: Optional[str] = None
-) -> str:
-    """Approve leave request for an employee. Search by name, find leave request by applied date, and approve it."""
-    return _run_with_stderr_redirect(
-        hrms_leave_approve_admin,
-        employee_name=employee_name,
-        applied_date=applied_date,
-        remarks=remarks
-    )
-
-
-@mcp.tool()
-def hrms_leave_cancel_admin_tool(
-    employee_name: str,
-    applied_date: str,
-    remarks: Optional[str] = None
-) -> str:
-    """Cancel leave request for an employee. Search by name, find leave request by applied date, and cancel it."""
-    return _run_with_stderr_redirect(
-        hrms_leave_cancel_admin,
-        employee_name=employee_name,
-        applied_date=applied_date,
-        remarks=remarks
-    )
-
-
-@mcp.tool()
-def hrms_attendance_approve_admin_tool(
-    employee_name: str,
-    applied_date: str,
-    requested_time: str,
-    remarks: Optional[str] = None
-) -> str:
-    """Approve manual attendance request for an employee. Search by name, find attendance request by applied date and time type, and approve it."""
-    return _run_with_stderr_redirect(
-        hrms_attendance_approve_admin,
-        employee_name=employee_name,
-        applied_date=applied_date,
-        requested_time=requested_time,
-        remarks=remarks
-    )
-
-
-@mcp.tool()
-def hrms_attendance_cancel_admin_tool(
-    employee_name: str,
-    applied_date: str,
-    requested_time: str,
-    remarks: Optional[str] = None
-) -> str:
-    """Cancel manual attendance request for an employee. Search by name, find attendance request by applied date and time type, and cancel it."""
-    return _run_with_stderr_redirect(
-        hrms_attendance_cancel_admin,
-        employee_name=employee_name,
-        applied_date=applied_date,
-        requested_time=requested_time,
-        remarks=remarks
-    )
+    from app.workflows.prompt_loader import get_hitl_settings
+    from app.workflows.tools._hrms_http import get_token
+    
+    try:
+        get_hitl_settings()
+        get_token()
+    except Exception as e:
+        print(f"[MCP Server] Warm-up failed: {str(e)}", flush=True)
 
 
 if __name__ == "__main__":
     # Parse command line arguments
     transport = sys.argv[1] if len(sys.argv) > 1 else "stdio"
     port = int(sys.argv[2]) if len(sys.argv) > 2 else 8001
+    host = sys.argv[3] if len(sys.argv) > 3 else "0.0.0.0"
+    
+    # Warm up in the background so the server starts accepting requests immediately
+    threading.Thread(target=_warm, name="mcp-warmup", daemon=True).start()
     
     if transport == "http":
-        # Run MCP server with HTTP transport for external access
-        print(f"[MCP Server] Starting HTTP server on port {port}...", flush=True)
-        mcp.run(transport="http", host="0.0.0.0", port=port)
+        # Run MCP server with HTTP transport (local sidecar or external access)
+        print(f"[MCP Server] Starting HTTP server on {host}:{port}...", flush=True)
+        mcp.run(transport="http", host=host, port=port)
     else:
         # Run MCP server with STDIO transport (default, for subprocess use)
-        # Note: Tool executions redirect their stdout to stderr via _run_with_stderr_redirect
-        # This keeps the MCP JSONRPC protocol clean on stdout
+        # Note: sys.stdout text goes to stderr (see _StdoutToStderr), keeping stdout clean for JSONRPC
         mcp.run(transport="stdio")
@@ -0,0 +1,209 @@
+"""Supervised local HTTP MCP server.
+
+When the agent uses MCP tools (USE_NATIVE_TOOLS is False), MCP_SERVER_TRANSPORT
+is "http" and MCP_SERVER_URL points at this host, the FastAPI app launches
+``python -m mcp_server.server http <port>`` at startup and keeps it running, so
+tool calls go over a local HTTP connection instead of spawning a STDIO
+subprocess. With several uvicorn workers, only the one holding the host-wide
+lock file launches and supervises it; the others use that server.
+
+Usage (from the FastAPI lifespan):
+    await start_mcp_sidecar()
+    ...
+    await stop_mcp_sidecar()
+"""
+
+import asyncio
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+from app.core.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the port check alone
+    fcntl = None
+
+# Seconds to wait for the server to accept connections after launch
+STARTUP_TIMEOUT = 20.0
+
+# Seconds between liveness checks of the server process
+SUPERVISE_INTERVAL = 5.0
+
+# Consecutive crash restarts before supervision gives up, and the longest wait between them
+MAX_RESTARTS = 5
+MAX_RESTART_DELAY = 60.0
+
+# Seconds a restarted process must stay up before its crash count is reset
+STABLE_UPTIME = 60.0
+
+_LOCAL_HOSTS = {"127.0.0.1", "localhost", "0.0.0.0", "::1"}
+
+_process: Optional[subprocess.Popen] = None
+_supervisor: Optional[asyncio.Task] = None
+_lock_file = None
+
+
+def _local_address() -> Optional[tuple]:
+    """Return (host, port) of MCP_SERVER_URL if it is served from this host."""
+    parsed = urlparse(settings.MCP_SERVER_URL)
+    if parsed.hostname not in _LOCAL_HOSTS:
+        return None
+    host = "127.0.0.1" if parsed.hostname == "0.0.0.0" else parsed.hostname
+    return host, parsed.port or settings.MCP_SERVER_PORT
+
+
+async def _is_listening(host: str, port: int) -> bool:
+    """Check whether something already accepts connections on host:port."""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=0.5)
+    except (OSError, TimeoutError):
+        return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
+
+def _acquire_launch_lock(port: int) -> bool:
+    """Try to become the one process on this host that runs the server on port.
+
+    The lock is held until stop_mcp_sidecar() or until this process exits, so
+    a new worker can take over after the owner dies.
+    """
+    global _lock_file
+    if fcntl is None:
+        return True
+    lock_file = open(Path(tempfile.gettempdir()) / f"hrms-mcp-sidecar-{port}.lock", "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _lock_file = lock_file
+    return True
+
+
+def _release_launch_lock() -> None:
+    global _lock_file
+    if _lock_file is not None:
+        _lock_file.close()  # Closing the file drops the flock
+        _lock_file = None
+
+
+def _launch(host: str, port: int) -> subprocess.Popen:
+    """Start the MCP server process bound to host:port."""
+    project_root = Path(__file__).parent.parent
+    print(f"[MCP Sidecar] Starting MCP server on {host}:{port}", flush=True)
+    return subprocess.Popen(
+        [sys.executable, "-m", "mcp_server.server", "http", str(port), host],
+        cwd=str(project_root)
+    )
+
+
+async def _wait_until_ready(host: str, port: int) -> bool:
+    """Poll until the server accepts connections or the timeout expires."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + STARTUP_TIMEOUT
+    while loop.time() < deadline:
+        if _process is not None and _process.poll() is not None:
+            return False
+        if await _is_listening(host, port):
+            return True
+        await asyncio.sleep(0.2)
+    return False
+
+
+async def _supervise(host: str, port: int) -> None:
+    """Restart the server process if it exits while the app is running.
+
+    Consecutive crashes back off exponentially (up to MAX_RESTART_DELAY) and
+    supervision gives up after MAX_RESTARTS of them; a process that stays up
+    for STABLE_UPTIME resets the count.
+    """
+    global _process
+    loop = asyncio.get_running_loop()
+    restarts = 0
+    started_at = loop.time()
+    while True:
+        await asyncio.sleep(SUPERVISE_INTERVAL)
+        if _process is None or _process.poll() is None:
+            continue
+
+        if loop.time() - started_at >= STABLE_UPTIME:
+            restarts = 0
+        if restarts >= MAX_RESTARTS:
+            print(f"[MCP Sidecar] MCP server exited with code {_process.returncode}; "
+                  f"giving up after {restarts} restarts", flush=True)
+            return
+
+        delay = min(SUPERVISE_INTERVAL * 2 ** restarts, MAX_RESTART_DELAY)
+        restarts += 1
+        print(f"[MCP Sidecar] MCP server exited with code {_process.returncode}, "
+              f"restarting in {delay:.0f}s ({restarts}/{MAX_RESTARTS})", flush=True)
+        await asyncio.sleep(delay)
+        _process = _launch(host, port)
+        started_at = loop.time()
+
+
+def should_start_mcp_sidecar() -> bool:
+    """Whether this app should launch the local HTTP MCP server itself."""
+    return (
+        settings.MCP_SERVER_ENABLED
+        and settings.MCP_SERVER_AUTOSTART
+        and not settings.USE_NATIVE_TOOLS
+        and settings.MCP_SERVER_TRANSPORT == "http"
+        and _local_address() is not None
+    )
+
+
+async def start_mcp_sidecar() -> None:
+    """Launch the local MCP server unless another worker owns it or one is already listening."""
+    global _process, _supervisor
+
+    if not should_start_mcp_sidecar() or _process is not None:
+        return
+
+    host, port = _local_address()
+    if not _acquire_launch_lock(port):
+        print(f"[MCP Sidecar] MCP server on {host}:{port} is managed by another worker", flush=True)
+        return
+    if await _is_listening(host, port):
+        print(f"[MCP Sidecar] MCP server already listening on {host}:{port}", flush=True)
+        _release_launch_lock()
+        return
+
+    _process = _launch(host, port)
+    if await _wait_until_ready(host, port):
+        print(f"[MCP Sidecar] ✓ MCP server ready on {host}:{port}", flush=True)
+    else:
+        print(f"[MCP Sidecar] ⚠️ MCP server not reachable on {host}:{port} yet", flush=True)
+    _supervisor = asyncio.create_task(_supervise(host, port))
+
+
+async def stop_mcp_sidecar() -> None:
+    """Stop the supervised MCP server, if this process started one."""
+    global _process, _supervisor
+
+    if _supervisor is not None:
+        _supervisor.cancel()
+        _supervisor = None
+
+    if _process is None:
+        _release_launch_lock()
+        return
+
+    _process.terminate()
+    try:
+        await asyncio.to_thread(_process.wait, 10)
+    except subprocess.TimeoutExpired:
+        _process.kill()
+    _process = None
+    _release_launch_lock()
+    print("[MCP Sidecar] MCP server stopped", flush=True)
@@ -1,11 +1,14 @@
 """Pytest configuration and fixtures."""
 import pytest
+import functools
+import httpx
+import json
 import os
-import asyncio
+import random
 import uuid
-from typing import Generator, Dict
+from typing import Dict
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -27,23 +30,90 @@
 os.environ["SECRET_KEY"] = os.getenv("SECRET_KEY", "test-secret-key-for-testing")
 os.environ["USER_AGENT"] = os.getenv("USER_AGENT", "RAG-Pipeline-Test/1.0")
 os.environ["DEBUG"] = "true"
+# Don't launch the HTTP MCP server from the app lifespan during tests
+os.environ["MCP_SERVER_AUTOSTART"] = os.getenv("MCP_SERVER_AUTOSTART", "false")
 
 from app.core.database import Base, get_db
 from app.main import app
-from app.models.agent_session import get_session, delete_session
 from app.models.database import AgentSession
+from app.services.chat_service import ChatService
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a test database session."""
+def pytest_addoption(parser):
+    """Add --integration to run tests against the real LLM."""
+    parser.addoption(
+        "--integration",
+        action="store_true",
+        default=False,
+        help="run integration tests and use the real chat model (or set INTEGRATION=1)",
+    )
+
+
+def _is_integration_run(config) -> bool:
+    return config.getoption("--integration") or os.getenv("INTEGRATION") == "1"
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked integration unless this is an integration run."""
+    if _is_integration_run(config):
+        return
+    skip_integration = pytest.mark.skip(reason="needs --integration or INTEGRATION=1")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_integration)
+
+
+@pytest.fixture(autouse=True)
+def mock_chat(request, monkeypatch):
+    """Replace the LLM-backed chat stream with a canned one outside integration runs.
+    
+    The fake stream echoes the message as a single token followed by a done
+    chunk, carrying the thread_id chosen by the endpoint.
+    """
+    if _is_integration_run(request.config):
+        return
+    
+    async def _fake_stream_chat(self, message, user_id=None, thread_id=None, employee_id=None):
+        content = f"Echo: {message}"
+        yield {"type": "token", "content": content, "thread_id": thread_id}
+        yield {"type": "done", "content": content, "thread_id": thread_id}
+    
+    monkeypatch.setattr(ChatService, "stream_chat", _fake_stream_chat)
+
+
+# Session factory shared by every test; each session is bound when it is created
+TestingSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    join_transaction_mode="create_savepoint",
+)
+
+# Test session bound to the current test's connection, if any (see db_session)
+_current_db_session = None
+
+
+def _worker_schema() -> str:
+    """Return the Postgres schema for this pytest-xdist worker ("gw0" when not distributed)."""
+    return f"test_{os.environ.get('PYTEST_XDIST_WORKER', 'gw0')}"
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Create the test database engine and tables once per test run."""
     # Use in-memory SQLite for faster tests (if not using PostgreSQL)
     # For PostgreSQL tests, use the actual database
     database_url = os.getenv("TEST_DATABASE_URL")
     
     if database_url and "postgresql" in database_url:
-        # Use PostgreSQL
-        engine = create_engine(database_url, poolclass=StaticPool)
+        # Use PostgreSQL, with one schema per pytest-xdist worker
+        schema = _worker_schema()
+        engine = create_engine(
+            database_url,
+            poolclass=StaticPool,
+            connect_args={"options": f"-csearch_path={schema}"},
+        )
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f'CREATE SCHEMA IF NOT EXISTS "{schema}"')
     else:
         # Use in-memory SQLite for unit tests
         engine = create_engine(
@@ -51,59 +121,85 @@ def db_session():
             connect_args={"check_same_thread": False},
             poolclass=StaticPool,
         )
-    
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        
+        # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN
+        @event.listens_for(engine, "connect")
+        def _disable_pysqlite_begin(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+        
+        @event.listens_for(engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
     
     # Create tables
     Base.metadata.create_all(bind=engine)
     
-    # Create session
-    session = TestingSessionLocal()
+    try:
+        yield engine
+    finally:
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def db_session(engine):
+    """Create a test database session rolled back after the test.
+    
+    The app's own commits only release a SAVEPOINT inside the outer
+    transaction, so nothing a test writes survives it.
+    """
+    global _current_db_session
+    
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = TestingSessionLocal(bind=connection)
+    _current_db_session = session
     
     try:
         yield session
     finally:
+        _current_db_session = None
         session.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
-@pytest.fixture(scope="function")
-def client(db_session):
-    """Create a test client."""
+@pytest.fixture(scope="session", autouse=True)
+def override_db(engine):
+    """Route the app's get_db dependency to the current test's session."""
     def override_get_db():
+        if _current_db_session is not None:
+            yield _current_db_session
+            return
+        
+        # Tests that don't use db_session get a normal committing session
+        session = TestingSessionLocal(bind=engine)
         try:
-            yield db_session
+            yield session
         finally:
-            db_session.close()
+            session.close()
     
     app.dependency_overrides[get_db] = override_get_db
+    yield
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="session")
+def client(override_db):
+    """Create a test client shared by every test (runs the app lifespan once).
     
+    Entering the client keeps one event-loop portal open for the whole run,
+    so every request reuses it instead of starting its own. Tests that need
+    real concurrency use async_client instead.
+    """
     with TestClient(app) as test_client:
         yield test_client
-    
-    app.dependency_overrides.clear()
 
 
-@pytest.fixture
-def auth_headers(client):
-    """Create authentication headers for testing."""
-    # Register a test user
-    register_response = client.post(
-        "/api/v1/auth/register",
-        json={
-            "email": "test@example.com",
-            "password": "testpassword123"
-        }
-    )
-    
-    # Login to get token
-    login_response = client.post(
-        "/api/v1/auth/login",
-        json={
-            "email": "test@example.com",
-            "password": "testpassword123"
-        }
-    )
+def _register_and_login(client, credentials: Dict[str, str]) -> Dict[str, str]:
+    """Register a user (ignoring "already exists") and return its auth headers."""
+    client.post("/api/v1/auth/register", json=credentials)
+    login_response = client.post("/api/v1/auth/login", json=credentials)
     
     if login_response.status_code == 200:
         token = login_response.json().get("access_token")
@@ -111,7 +207,21 @@ def auth_headers(client):
     return {}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def auth_headers(client):
+    """Create authentication headers for testing.
+    
+    Session-scoped fixtures are set up before any function-scoped db_session,
+    so the user is committed outside the per-test rollback and the token
+    stays valid for the whole run.
+    """
+    return _register_and_login(
+        client,
+        {"email": "test@example.com", "password": "testpassword123"}
+    )
+
+
+@pytest.fixture(scope="session")
 def auth_headers_multi(client):
     """Create authentication headers for multiple test users.
     
@@ -123,32 +233,32 @@ def auth_headers_multi(client):
         "user3": {"email": "user3@example.com", "password": "testpass123"},
     }
     
+    # Registered one at a time: the test engine shares a single connection
     headers = {}
     for user_id, credentials in users.items():
-        # Register user
-        client.post("/api/v1/auth/register", json=credentials)
-        
-        # Login to get token
-        login_response = client.post("/api/v1/auth/login", json=credentials)
-        
-        if login_response.status_code == 200:
-            token = login_response.json().get("access_token")
-            headers[user_id] = {"Authorization": f"Bearer {token}"}
+        user_headers = _register_and_login(client, credentials)
+        if user_headers:
+            headers[user_id] = user_headers
     
     return headers
 
 
+# Deterministic session ids for session_factory, seeded apart from the test
+# modules' pools and per pytest-xdist worker
+_rng = random.Random(f"session_factory:{os.environ.get('PYTEST_XDIST_WORKER', 'gw0')}")
+_UUID_POOL = [uuid.UUID(int=_rng.getrandbits(128), version=4) for _ in range(128)]
+_UUID_ITER = iter(_UUID_POOL)
+
+
 @pytest.fixture
-def session_factory(client, auth_headers):
+def session_factory(client, auth_headers, db_session):
     """Factory fixture for creating HRMS sessions with different employee IDs.
     
     Returns a callable that creates and initializes a session.
     Usage: session_id = session_factory(employee_id=335, employee_name="John Doe")
     """
-    created_sessions = []
-    
     def _create_session(employee_id: int, employee_name: str) -> str:
-        session_id = str(uuid.uuid4())
+        session_id = str(next(_UUID_ITER))
         response = client.post(
             "/api/v1/agent/session-init",
             json={
@@ -159,65 +269,120 @@ def _create_session(employee_id: int, employee_name: str) -> str:
             headers=auth_headers
         )
         assert response.status_code == 200, f"Failed to create session: {response.json()}"
-        created_sessions.append(session_id)
         return session_id
     
-    yield _create_session
-    
-    # Cleanup: delete all created sessions
-    for session_id in created_sessions:
-        try:
-            client.delete(f"/api/v1/agent/session/{session_id}", headers=auth_headers)
-        except:
-            pass
+    # Sessions are removed with the rest of the test's rows on rollback
+    return _create_session
 
 
 @pytest.fixture
 def cleanup_sessions(db_session):
-    """Cleanup fixture to clear agent sessions from database after each test."""
+    """Cleanup fixture to clear agent sessions from database after each test.
+    
+    Safe under pytest-xdist: it only touches this worker's database (see engine).
+    """
     yield
     # Clear all sessions from the database after test
     db_session.query(AgentSession).delete()
     db_session.commit()
 
 
-@pytest.fixture
-async def cleanup_threads():
-    """Cleanup fixture to clear LangGraph checkpoints after each test.
+# Prefix of an SSE data line, as bytes
+SSE_DATA_PREFIX = b"data: "
+SSE_DATA_PREFIX_LEN = len(SSE_DATA_PREFIX)
+
+
+def _split_lines(buffer: bytearray, data: bytes):
+    """Append data to buffer and yield every complete line it now holds."""
+    buffer += data
+    while (newline := buffer.find(b"\n")) != -1:
+        line = bytes(buffer[:newline]).rstrip(b"\r")
+        del buffer[:newline + 1]
+        yield line
+
+
+class _SSEAccumulator:
+    """Collects chunks, thread_id and token contents from SSE data lines."""
     
-    Note: This is an async fixture that clears checkpoint data from PostgreSQL.
-    """
-    yield
+    def __init__(self):
+        self.token_parts = []
+        self.chunks = []
+        self.thread_id = None
     
-    # Clean up checkpoint data
-    try:
-        from app.workflows.rag_graph import get_checkpointer
-        checkpointer = await get_checkpointer()
-        # Note: AsyncPostgresSaver doesn't have a clear method by default
-        # In production, you might want to delete specific thread checkpoints
-        # For now, we'll rely on test database isolation
-    except Exception as e:
-        print(f"Warning: Could not cleanup checkpoints: {e}")
+    def feed(self, line: bytes) -> bool:
+        """Parse one line; return True if it carried a data chunk.
+        
+        Blank separators and ":" comment lines (keepalives) are skipped; a
+        data line that isn't valid JSON is a server bug and raises.
+        """
+        if not line or line[:1] == b":" or line[:SSE_DATA_PREFIX_LEN] != SSE_DATA_PREFIX:
+            return False
+        chunk = json.loads(line[SSE_DATA_PREFIX_LEN:])
+        self.chunks.append(chunk)
+        get = chunk.get
+        if not self.thread_id:
+            self.thread_id = get("thread_id")
+        if get("type") == "token":
+            self.token_parts.append(get("content") or "")
+        return True
+    
+    def result(self, status_code: int) -> Dict:
+        return {
+            "status_code": status_code,
+            "full_response": "".join(self.token_parts),
+            "chunks": self.chunks,
+            "thread_id": self.thread_id
+        }
 
 
-@pytest.fixture
-def parse_sse_response():
-    """Helper fixture to parse Server-Sent Events (SSE) streaming responses.
+def _parse_streaming_response(client, method, url, headers, json_data):
+    """Helper to handle streaming responses from TestClient.
     
-    Returns a callable that parses SSE response and extracts chunks.
+    Token contents are kept as a list and joined once at the end.
     """
-    def _parse(response_text: str) -> list:
-        """Parse SSE response into a list of data chunks."""
-        chunks = []
-        for line in response_text.split('\n'):
-            if line.startswith('data: '):
-                import json
-                try:
-                    data = json.loads(line[6:])  # Remove 'data: ' prefix
-                    chunks.append(data)
-                except json.JSONDecodeError:
-                    continue
-        return chunks
-    
-    return _parse
+    with client.stream(method, url, headers=headers, json=json_data) as response:
+        acc = _SSEAccumulator()
+        buffer = bytearray()
+        for data in response.iter_bytes():
+            for line in _split_lines(buffer, data):
+                acc.feed(line)
+        if buffer:
+            acc.feed(bytes(buffer))
+        return acc.result(response.status_code)
 
+
+async def _aparse_streaming_response(async_client, method, url, headers, json_data):
+    """Async counterpart of _parse_streaming_response for httpx.AsyncClient."""
+    async with async_client.stream(method, url, headers=headers, json=json_data) as response:
+        acc = _SSEAccumulator()
+        buffer = bytearray()
+        async for data in response.aiter_bytes():
+            for line in _split_lines(buffer, data):
+                acc.feed(line)
+        if buffer:
+            acc.feed(bytes(buffer))
+        return acc.result(response.status_code)
+
+
+@pytest.fixture(scope="session")
+def sse_parser(client):
+    """Stream a request through the shared client and parse its SSE chunks.
+    
+    Usage: result = sse_parser("POST", "/api/v1/chat", headers=..., json_data={...})
+    """
+    return functools.partial(_parse_streaming_response, client)
+
+
+@pytest.fixture
+async def async_client(override_db):
+    """Async client on the app's ASGI interface, for driving requests concurrently."""
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+def async_sse_parser(async_client):
+    """Async sse_parser: result = await async_sse_parser("POST", url, headers=..., json_data=...)."""
+    return functools.partial(_aparse_streaming_response, async_client)
@@ -1,9 +1,27 @@
 """Integration tests for HRMS session management and employee context."""
 import pytest
-import time
+import os
+import random
 import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
 from app.models.agent_session import get_session
-from app.core.database import get_db
+from app.models.database import AgentSession
+
+# Deterministic session ids, generated once instead of calling uuid4() per test;
+# seeded per module and pytest-xdist worker so parallel workers never share ids
+_rng = random.Random(f"{__name__}:{os.environ.get('PYTEST_XDIST_WORKER', 'gw0')}")
+_UUID_POOL = [uuid.UUID(int=_rng.getrandbits(128), version=4) for _ in range(128)]
+_UUID_ITER = iter(_UUID_POOL)
+
+Sess = namedtuple("Sess", "id emp_id name")
+
+# Sessions for test_multiple_sessions; each case initializes and checks its own
+_SESSIONS = [
+    Sess(str(next(_UUID_ITER)), 335, "Neha Muquith"),
+    Sess(str(next(_UUID_ITER)), 336, "John Doe"),
+    Sess(str(next(_UUID_ITER)), 337, "Jane Smith"),
+]
 
 
 class TestSessionManagement:
@@ -18,7 +36,7 @@ def test_session_init_and_context_retrieval(self, client, auth_headers, cleanup_
         3. Retrieved session context matches initialization data
         """
         # Initialize session with employee data
-        session_id = str(uuid.uuid4())
+        session_id = str(next(_UUID_ITER))
         employee_id = 335
         employee_name = "Neha Muquith"
         
@@ -63,11 +81,10 @@ def test_session_expiration(self, client, auth_headers, cleanup_sessions, db_ses
         3. Expired session returns None/404
         """
         from app.models.agent_session import create_session
-        from datetime import datetime, timezone, timedelta
         
-        # Create a session with short TTL for testing (~1 second)
-        session_id = str(uuid.uuid4())
-        session = create_session(
+        # Create a session with short TTL for testing
+        session_id = str(next(_UUID_ITER))
+        create_session(
             db=db_session,
             session_id=session_id,
             employee_id=335,
@@ -80,14 +97,18 @@ def test_session_expiration(self, client, auth_headers, cleanup_sessions, db_ses
         assert retrieved is not None
         assert retrieved.employee_id == 335
         
-        # Wait for expiration (1.5 seconds to be safe)
-        time.sleep(1.5)
+        # Fast-forward past the TTL instead of sleeping
+        db_session.query(AgentSession).filter_by(session_id=session_id).update(
+            {"expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}
+        )
+        db_session.commit()
         
         # Verify session has expired
         expired = get_session(db=db_session, session_id=session_id)
         assert expired is None
     
-    def test_multiple_sessions(self, client, auth_headers, cleanup_sessions, db_session):
+    @pytest.mark.parametrize("sess", _SESSIONS, ids=lambda sess: f"employee_{sess.emp_id}")
+    def test_multiple_sessions(self, client, auth_headers, cleanup_sessions, sess):
         """Test multiple concurrent sessions for different employees.
         
         Verifies that:
@@ -95,42 +116,25 @@ def test_multiple_sessions(self, client, auth_headers, cleanup_sessions, db_sess
         2. Each session maintains its own employee context
         3. Sessions don't interfere with each other
         """
-        # Initialize 3 different sessions
-        sessions = [
-            {"id": str(uuid.uuid4()), "employee_id": 335, "name": "Neha Muquith"},
-            {"id": str(uuid.uuid4()), "employee_id": 336, "name": "John Doe"},
-            {"id": str(uuid.uuid4()), "employee_id": 337, "name": "Jane Smith"},
-        ]
-        
-        # Create all sessions
-        for session in sessions:
-            response = client.post(
-                "/api/v1/agent/session-init",
-                json={
-                    "sessionId": session["id"],
-                    "employeeId": session["employee_id"],
-                    "employeeName": session["name"]
-                },
-                headers=auth_headers
-            )
-            assert response.status_code == 200
-            assert response.json()["success"] is True
-        
-        # Verify all sessions stored independently in database
-        for session in sessions:
-            context = get_session(db=db_session, session_id=session["id"])
-            assert context is not None
-            assert context.session_id == session["id"]
-            assert context.employee_id == session["employee_id"]
-            assert context.employee_name == session["name"]
-        
-        # Verify correct employee_id retrieved for each session
-        for session in sessions:
-            get_response = client.get(f"/api/v1/agent/session/{session['id']}", headers=auth_headers)
-            assert get_response.status_code == 200
-            data = get_response.json()
-            assert data["employee_id"] == session["employee_id"]
-            assert data["employee_name"] == session["name"]
+        response = client.post(
+            "/api/v1/agent/session-init",
+            json={
+                "sessionId": sess.id,
+                "employeeId": sess.emp_id,
+                "employeeName": sess.name
+            },
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["success"] is True
+        
+        # Verify the session keeps its own employee context
+        get_response = client.get(f"/api/v1/agent/session/{sess.id}", headers=auth_headers)
+        assert get_response.status_code == 200
+        session_data = get_response.json()
+        assert session_data["session_id"] == sess.id
+        assert session_data["employee_id"] == sess.emp_id
+        assert session_data["employee_name"] == sess.name
     
     def test_session_deletion(self, client, auth_headers, cleanup_sessions, db_session):
         """Test session deletion/invalidation.
@@ -141,7 +145,7 @@ def test_session_deletion(self, client, auth_headers, cleanup_sessions, db_sessi
         3. Attempting to retrieve deleted session returns 404
         """
         # Create session
-        session_id = str(uuid.uuid4())
+        session_id = str(next(_UUID_ITER))
         response = client.post(
             "/api/v1/agent/session-init",
             json={
@@ -172,7 +176,7 @@ def test_session_deletion(self, client, auth_headers, cleanup_sessions, db_sessi
     
     def test_session_not_found(self, client, auth_headers):
         """Test retrieving non-existent session returns 404."""
-        non_existent_id = str(uuid.uuid4())
+        non_existent_id = str(next(_UUID_ITER))
         response = client.get(f"/api/v1/agent/session/{non_existent_id}", headers=auth_headers)
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
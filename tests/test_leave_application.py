@@ -1,43 +1,46 @@
 """Integration tests for HRMS leave application functionality."""
+import logging
 import pytest
-import json
-import uuid
+from uuid import uuid4
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
 
-def parse_streaming_response(client, method, url, headers, json_data):
-    """Helper to handle streaming responses from TestClient."""
-    with client.stream(method, url, headers=headers, json=json_data) as response:
-        full_response = ""
-        chunks = []
-        thread_id = None
-        
-        for line in response.iter_lines():
-            if line:
-                if line.startswith('data: '):
-                    try:
-                        chunk = json.loads(line[6:])
-                        chunks.append(chunk)
-                        if chunk.get("thread_id") and not thread_id:
-                            thread_id = chunk["thread_id"]
-                        if chunk.get("type") == "token":
-                            full_response += chunk.get("content", "")
-                    except json.JSONDecodeError:
-                        continue
-        
-        return {
-            "status_code": response.status_code,
-            "full_response": full_response,
-            "chunks": chunks,
-            "thread_id": thread_id
-        }
+
+@pytest.fixture(scope="module")
+def today():
+    """Reference date shared by every test in this module."""
+    return datetime.now()
+
+
+@pytest.fixture(scope="module")
+def next_monday_str(today):
+    """Next week's Monday, formatted as e.g. "March 03"."""
+    days_ahead = (0 - today.weekday() + 7) % 7 + 7  # Next Monday
+    return (today + timedelta(days=days_ahead)).strftime("%B %d")
+
+
+@pytest.fixture(scope="module")
+def monday_two_weeks_str(today):
+    """Monday two weeks ahead, formatted as e.g. "March 10"."""
+    days_ahead = (0 - today.weekday() + 7) % 7 + 14  # Monday 2 weeks ahead
+    return (today + timedelta(days=days_ahead)).strftime("%B %d")
+
+
+@pytest.fixture(scope="module")
+def next_saturday_str(today):
+    """The next Saturday after today, formatted as e.g. "March 08"."""
+    days_ahead = (5 - today.weekday() + 7) % 7  # Saturday = 5
+    if days_ahead == 0:
+        days_ahead = 7
+    return (today + timedelta(days=days_ahead)).strftime("%B %d")
 
 
 class TestLeaveApplication:
     """Test suite for leave application via chat with HRMS API integration."""
     
     def test_leave_application_with_session_context(
-        self, client, auth_headers, session_factory, cleanup_sessions
+        self, auth_headers, session_factory, cleanup_sessions, sse_parser, next_monday_str
     ):
         """Test leave application with session context providing employee_id.
         
@@ -49,15 +52,11 @@ def test_leave_application_with_session_context(
         # Create session for employee 335
         session_id = session_factory(employee_id=335, employee_name="Neha Muquith")
         
-        # Calculate a weekday date (Monday = 0)
-        today = datetime.now()
-        days_ahead = (0 - today.weekday() + 7) % 7 + 7  # Next Monday
-        target_date = today + timedelta(days=days_ahead)
-        date_str = target_date.strftime("%B %d")
+        date_str = next_monday_str
         
         # Send chat message to apply for leave
-        result = parse_streaming_response(
-            client, "POST", "/api/v1/chat",
+        result = sse_parser(
+            "POST", "/api/v1/chat",
             headers=auth_headers,
             json_data={
                 "message": f"Apply for 1 day sick leave on {date_str} for medical checkup",
@@ -66,10 +65,10 @@ def test_leave_application_with_session_context(
         )
         
         assert result["status_code"] == 200
-        print(f"\n[TEST] Chunks received: {len(result['chunks'])}")
-        print(f"\n[TEST] Response length: {len(result['full_response'])}")
+        logger.debug("[TEST] Chunks received: %d", len(result["chunks"]))
+        logger.debug("[TEST] Response length: %d", len(result["full_response"]))
         if result["chunks"]:
-            print(f"\n[TEST] Sample chunks: {result['chunks'][:3]}")
+            logger.debug("[TEST] Sample chunks: %s", result["chunks"][:3])
         
         # Verify we got chunks
         assert len(result["chunks"]) > 0, "No chunks received"
@@ -80,10 +79,10 @@ def test_leave_application_with_session_context(
         
         assert has_done or has_content, "No done chunk or content received"
         
-        print(f"\n[TEST] Leave application response: {result['full_response'][:200]}")
+        logger.debug("[TEST] Leave application response: %.200s", result["full_response"])
     
     def test_leave_application_without_session(
-        self, client, auth_headers, cleanup_sessions
+        self, auth_headers, cleanup_sessions, sse_parser, monday_two_weeks_str
     ):
         """Test leave application without session_id.
         
@@ -92,15 +91,11 @@ def test_leave_application_without_session(
         2. Warning is logged about missing session
         3. Leave application still proceeds (degraded mode)
         """
-        # Calculate a weekday date
-        today = datetime.now()
-        days_ahead = (0 - today.weekday() + 7) % 7 + 14  # Monday 2 weeks ahead
-        target_date = today + timedelta(days=days_ahead)
-        date_str = target_date.strftime("%B %d")
+        date_str = monday_two_weeks_str
         
         # Send chat message without session_id
-        result = parse_streaming_response(
-            client, "POST", "/api/v1/chat",
+        result = sse_parser(
+            "POST", "/api/v1/chat",
             headers=auth_headers,
             json_data={
                 "message": f"Apply for 1 day sick leave on {date_str}",
@@ -110,10 +105,10 @@ def test_leave_application_without_session(
         
         assert result["status_code"] == 200
         assert len(result["full_response"]) > 0
-        print(f"\n[TEST] Leave without session response: {result['full_response'][:200]}")
+        logger.debug("[TEST] Leave without session response: %.200s", result["full_response"])
     
     def test_leave_application_weekend_handling(
-        self, client, auth_headers, session_factory, cleanup_sessions
+        self, auth_headers, session_factory, cleanup_sessions, sse_parser, next_saturday_str
     ):
         """Test leave application on weekend dates.
         
@@ -125,17 +120,11 @@ def test_leave_application_weekend_handling(
         # Create session
         session_id = session_factory(employee_id=335, employee_name="Neha Muquith")
         
-        # Find next Saturday
-        today = datetime.now()
-        days_ahead = (5 - today.weekday() + 7) % 7  # Saturday = 5
-        if days_ahead == 0:
-            days_ahead = 7
-        target_date = today + timedelta(days=days_ahead)
-        date_str = target_date.strftime("%B %d")
+        date_str = next_saturday_str
         
         # Send chat message for weekend leave
-        result = parse_streaming_response(
-            client, "POST", "/api/v1/chat",
+        result = sse_parser(
+            "POST", "/api/v1/chat",
             headers=auth_headers,
             json_data={
                 "message": f"Apply for 1 day sick leave on {date_str}",
@@ -145,10 +134,10 @@ def test_leave_application_weekend_handling(
         
         assert result["status_code"] == 200
         assert len(result["full_response"]) > 0
-        print(f"\n[TEST] Weekend leave response: {result['full_response'][:200]}")
+        logger.debug("[TEST] Weekend leave response: %.200s", result["full_response"])
     
     def test_leave_application_invalid_session(
-        self, client, auth_headers, cleanup_sessions
+        self, auth_headers, cleanup_sessions, sse_parser
     ):
         """Test leave application with invalid/expired session_id.
         
@@ -158,10 +147,10 @@ def test_leave_application_invalid_session(
         3. Falls back to default behavior
         """
         # Use non-existent session_id
-        fake_session_id = str(uuid.uuid4())
+        fake_session_id = uuid4().hex
         
-        result = parse_streaming_response(
-            client, "POST", "/api/v1/chat",
+        result = sse_parser(
+            "POST", "/api/v1/chat",
             headers=auth_headers,
             json_data={
                 "message": "Apply for 1 day sick leave tomorrow",
@@ -173,8 +162,13 @@ def test_leave_application_invalid_session(
         assert result["status_code"] == 200
         assert len(result["full_response"]) > 0
     
+    @pytest.mark.parametrize("message", [
+        "Apply for 1 day sick leave tomorrow",
+        "Apply for 1 day sick leave on December 10th",
+        "I need sick leave for 2 days starting next Monday",
+    ])
     def test_leave_application_date_parsing(
-        self, client, auth_headers, session_factory, cleanup_sessions
+        self, auth_headers, session_factory, cleanup_sessions, sse_parser, message
     ):
         """Test various date formats for leave application.
         
@@ -185,28 +179,20 @@ def test_leave_application_date_parsing(
         """
         session_id = session_factory(employee_id=335, employee_name="Test User")
         
-        test_cases = [
-            "Apply for 1 day sick leave tomorrow",
-            "Apply for 1 day sick leave on December 10th",
-            "I need sick leave for 2 days starting next Monday",
-        ]
-        
-        for message in test_cases:
-            result = parse_streaming_response(
-                client, "POST", "/api/v1/chat",
-                headers=auth_headers,
-                json_data={
-                    "message": message,
-                    "session_id": session_id,
-                    "thread_id": str(uuid.uuid4())  # New thread for each test
-                }
-            )
-            
-            assert result["status_code"] == 200
-            assert len(result["chunks"]) > 0, f"No response for message: {message}"
+        result = sse_parser(
+            "POST", "/api/v1/chat",
+            headers=auth_headers,
+            json_data={
+                "message": message,
+                "session_id": session_id
+            }
+        )
+        
+        assert result["status_code"] == 200
+        assert len(result["chunks"]) > 0, f"No response for message: {message}"
     
     def test_multiple_day_leave_application(
-        self, client, auth_headers, session_factory, cleanup_sessions
+        self, auth_headers, session_factory, cleanup_sessions, sse_parser, next_monday_str
     ):
         """Test applying for multi-day leave.
         
@@ -217,14 +203,11 @@ def test_multiple_day_leave_application(
         """
         session_id = session_factory(employee_id=335, employee_name="Test User")
         
-        # Calculate date range (3 weekdays)
-        today = datetime.now()
-        days_ahead = (0 - today.weekday() + 7) % 7 + 7  # Next Monday
-        start_date = today + timedelta(days=days_ahead)
-        start_str = start_date.strftime("%B %d")
+        # 3 weekdays starting next Monday
+        start_str = next_monday_str
         
-        result = parse_streaming_response(
-            client, "POST", "/api/v1/chat",
+        result = sse_parser(
+            "POST", "/api/v1/chat",
             headers=auth_headers,
             json_data={
                 "message": f"Apply for 3 days sick leave starting {start_str}",
@@ -234,4 +217,4 @@ def test_multiple_day_leave_application(
         
         assert result["status_code"] == 200
         assert len(result["full_response"]) > 0
-        print(f"\n[TEST] Multi-day leave response: {result['full_response'][:200]}")
+        logger.debug("[TEST] Multi-day leave response: %.200s", result["full_response"])